@@ -17,9 +17,9 @@ from ursina.ursinastuff import *
 from ursina import input_handler
 from ursina.input_handler import held_keys, Keys
 from ursina.string_utilities import *
-from ursina.mesh_importer import load_model, load_blender_scene
+from ursina.mesh_importer import load_model, load_model_async, load_blender_scene
 from ursina.texture import Texture
-from ursina.texture_importer import load_texture
+from ursina.texture_importer import load_texture, load_texture_async
 from ursina import color
 from ursina.color import Color, hsv, rgb
 from ursina.sequence import Sequence, Func, Wait
@@ -31,6 +31,7 @@ from ursina.boxcast import boxcast
 from ursina.audio import Audio
 from ursina import music_system
 from ursina.duplicate import duplicate
+from ursina.spawn_many import spawn_many
 from panda3d.core import Quat
 from ursina.vec2 import Vec2
 from ursina.vec3 import Vec3
@@ -68,6 +69,11 @@ from ursina.scripts.grid_layout import grid_layout
 from ursina.scripts.scrollable import Scrollable
 from ursina.scripts.property_generator import generate_properties_for_class
 from ursina.scripts.every_decorator import every
+from ursina.scripts.update_lod import UpdateLOD
+from ursina.scripts.profiler import profiler
+from ursina.scripts.entity_pool import EntityPool
+from ursina.scripts.entity_group import EntityGroup
+from ursina.scripts.coroutines import start_coroutine, wait, next_frame, until
 
 from ursina.prefabs.tooltip import Tooltip
 from ursina.prefabs.text_field import TextField
@@ -78,6 +84,7 @@ from ursina.prefabs.button_group import ButtonGroup
 from ursina.prefabs.window_panel import WindowPanel, Space
 from ursina.prefabs.button_list import ButtonList
 from ursina.prefabs.checkbox import CheckBox
+from ursina.prefabs.instanced_group import InstancedGroup
 # from ursina.prefabs.file_browser import FileBrowser
 # from ursina.prefabs import primitives
 
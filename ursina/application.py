@@ -2,11 +2,14 @@ import sys
 from pathlib import Path
 from panda3d.core import getModelPath
 from ursina import string_utilities
+from ursina.scripts.ordered_set import OrderedSet
 
 paused = False
 time_scale = 1
 calculate_dt = True
-sequences = []
+fixed_timestep = None   # set to for example 1/60 to call fixed_update() on entities, scripts and the main script at a fixed rate. time.dt will be the fixed timestep inside fixed_update().
+max_fixed_steps = 5     # max fixed updates per frame. if a frame takes longer than this, the remaining time gets dropped so the game slows down instead of freezing.
+sequences = OrderedSet()
 trace_entity_definition = False # enable to set entity.line_definition
 print_entity_definition = False
 
@@ -0,0 +1,331 @@
+import sys
+import gc
+import json
+import random
+import tracemalloc
+from time import perf_counter
+from pathlib import Path
+from textwrap import dedent
+
+
+class Scenario:
+    '''Base class for benchmark scenarios. setup() runs once, update(i) runs before every frame and teardown() cleans up after.
+    Only time spent in update(i) and app.step() is measured, so do expensive preparation in setup().'''
+    name = 'scenario'
+    description = ''
+
+    def setup(self):
+        pass
+
+    def update(self, i):
+        pass
+
+    def teardown(self):
+        from ursina import scene
+        scene.clear()
+
+
+
+class SpawnDestroy(Scenario):
+    name = 'spawn_destroy'
+    description = 'spawn 200 entities with a model each frame and destroy the ones from the previous frame'
+
+    def setup(self):
+        self.entities = []
+
+    def update(self, i):
+        from ursina import Entity, destroy
+        for e in self.entities:
+            destroy(e)
+        self.entities = [Entity(model='cube', x=j%20, y=j//20) for j in range(200)]
+
+
+class StaticScene(Scenario):
+    name = 'static_scene'
+    description = '20000 entities without update(), 100 with'
+
+    def setup(self):
+        from ursina import Entity
+        class Mover(Entity):
+            def update(self):
+                self.x += .01
+
+        self.entities = [Entity() for i in range(20_000)]
+        self.movers = [Mover() for i in range(100)]
+
+
+class RaycastStorm(Scenario):
+    name = 'raycast'
+    description = '200 raycasts per frame against 500 box colliders'
+
+    def setup(self):
+        from ursina import Entity, Vec3
+        self.boxes = [Entity(model='cube', collider='box', position=(random.uniform(-20,20), random.uniform(-20,20), random.uniform(5,40))) for i in range(500)]
+        self.directions = [Vec3(random.uniform(-1,1), random.uniform(-1,1), 1).normalized() for i in range(200)]
+
+    def update(self, i):
+        from ursina import raycast, Vec3
+        for direction in self.directions:
+            raycast(Vec3(0,0,0), direction, distance=50)
+
+
+class MeshRegeneration(Scenario):
+    name = 'mesh_regeneration'
+    description = 'move all vertices of a 9999 vertex mesh and call generate() every frame'
+
+    def setup(self):
+        from ursina import Entity, Mesh, Vec3
+        self.vertices = [Vec3(random.random(), random.random(), random.random()) for i in range(9_999)]
+        self.entity = Entity(model=Mesh(vertices=self.vertices, static=False))
+
+    def update(self, i):
+        from ursina import Vec3
+        offset = Vec3(0, .001, 0)
+        self.entity.model.vertices = [v + offset * i for v in self.vertices]
+        self.entity.model.generate()
+
+
+class TextUpdate(Scenario):
+    name = 'text_update'
+    description = 'change the text of 50 Text entities every frame'
+
+    def setup(self):
+        from ursina import Text
+        self.texts = [Text(text='0', y=i*.01) for i in range(50)]
+
+    def update(self, i):
+        for j, t in enumerate(self.texts):
+            t.text = f'<orange>score:<default> {i * j}'
+
+
+class Animations(Scenario):
+    name = 'animate'
+    description = '2000 entities with a looping animate() on x, started at different times'
+
+    def setup(self):
+        from ursina import Entity
+        self.entities = [Entity() for i in range(2000)]
+
+    def update(self, i):
+        for e in self.entities[(i%20)*100 : (i%20)*100+100]:    # restart some each frame, so starting them gets measured too
+            e.animate('x', i%2, duration=.5, loop=True)
+
+
+class EntityConstruction(Scenario):
+    name = 'entity_construction'
+    description = 'construct 1000 entities of a subclass per frame, without models, and destroy the ones from the previous frame'
+
+    def setup(self):
+        from ursina import Entity
+        class Enemy(Entity):
+            def __init__(self, **kwargs):
+                super().__init__(**kwargs)
+                self.health = 10
+
+        self.enemy_class = Enemy
+        self.entities = []
+
+    def update(self, i):
+        from ursina import destroy
+        for e in self.entities:
+            destroy(e)
+        self.entities = [self.enemy_class(x=j%20, y=j//20, rotation_z=j, scale=.5) for j in range(1000)]
+
+
+class RPCRoundTrip(Scenario):
+    name = 'rpc_round_trip'
+    description = 'client sends an rpc to a host on localhost every frame and the host replies'
+
+    def setup(self):
+        import socket
+        from ursina.networking import RPCPeer, rpc
+
+        with socket.socket() as s:   # find a free port
+            s.bind(('localhost', 0))
+            port = s.getsockname()[1]
+
+        self.host = RPCPeer()
+        self.client = RPCPeer()
+        self.host.print_connect = self.host.print_disconnect = False
+        self.client.print_connect = self.client.print_disconnect = False
+        self.received = 0
+
+        @rpc(self.host)
+        def ping(connection, time_received, i: int):
+            self.host.pong(connection, i)
+
+        @rpc(self.client)
+        def pong(connection, time_received, i: int):
+            self.received += 1
+
+        self.host.start('localhost', port, is_host=True)
+        self.client.start('localhost', port)
+        from time import sleep
+        for i in range(5000):   # connecting happens on another thread, so wait for it
+            self.host.update()
+            self.client.update()
+            if self.client.connection_count() and self.host.connection_count():
+                break
+            sleep(.001)
+
+    def update(self, i):
+        for connection in self.client.get_connections():
+            self.client.ping(connection, i)
+        self.host.update()
+        self.client.update()
+
+    def teardown(self):
+        self.client.stop()
+        self.host.stop()
+        super().teardown()
+
+
+scenarios = {e.name: e for e in (SpawnDestroy, StaticScene, RaycastStorm, MeshRegeneration, TextUpdate, Animations, EntityConstruction, RPCRoundTrip)}
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(int(len(sorted_values) * p / 100), len(sorted_values)-1)]
+
+
+def run(names=None, frames=300, warmup=10, dt=1/60, allocations=True, seed=0, verbose=True):
+    '''Runs the scenarios headless with a fixed time.dt. Returns a dict of scenario name: results, times in ms and memory in KB.'''
+    import time
+    from ursina import Ursina, application, scene
+
+    app = Ursina(window_type='none', development_mode=False)
+    application.calculate_dt = False
+    time.dt = dt
+    time.dt_unscaled = dt
+
+    if names is None:
+        names = list(scenarios.keys())
+
+    results = dict()
+    for name in names:
+        if name not in scenarios:
+            raise ValueError(f'unknown scenario: {name}. choose from: {", ".join(scenarios.keys())}')
+
+        random.seed(seed)
+        scenario = scenarios[name]()
+        scenario.setup()
+        for i in range(warmup):
+            scenario.update(i)
+            app.step()
+
+        gc.collect()
+        gc_counts = [e['collections'] for e in gc.get_stats()]
+        frame_times = []
+        for i in range(frames):
+            t = perf_counter()
+            scenario.update(warmup + i)
+            app.step()
+            frame_times.append((perf_counter() - t) * 1000)
+        gc_collections = sum(e['collections'] for e in gc.get_stats()) - sum(gc_counts)
+
+        # measure allocations in a separate pass, since tracemalloc slows everything down
+        peak_allocations = []
+        memory_growth = 0
+        if allocations:
+            tracemalloc.start()
+            start_memory = tracemalloc.get_traced_memory()[0]
+            for i in range(min(frames, 60)):
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                scenario.update(warmup + frames + i)
+                app.step()
+                peak_allocations.append((tracemalloc.get_traced_memory()[1] - before) / 1024)
+            memory_growth = (tracemalloc.get_traced_memory()[0] - start_memory) / 1024
+            tracemalloc.stop()
+
+        scenario.teardown()
+        app.step()
+
+        sorted_times = sorted(frame_times)
+        results[name] = dict(
+            frames=frames,
+            mean=sum(frame_times) / len(frame_times),
+            p50=percentile(sorted_times, 50),
+            p90=percentile(sorted_times, 90),
+            p99=percentile(sorted_times, 99),
+            max=sorted_times[-1],
+            gc_collections=gc_collections,
+            peak_alloc_kb_per_frame=sum(peak_allocations) / len(peak_allocations) if peak_allocations else 0,
+            memory_growth_kb=memory_growth,
+            )
+        if verbose:
+            print(format_results({name: results[name]}, header=not len(results) > 1))
+
+    return results
+
+
+def format_results(results, header=True):
+    lines = []
+    if header:
+        lines.append(f'{"scenario":<20} {"mean ms":>8} {"p50":>8} {"p90":>8} {"p99":>8} {"max":>8} {"gc":>5} {"alloc KB/f":>11} {"growth KB":>10}')
+    for name, r in results.items():
+        lines.append(f'{name:<20} {r["mean"]:>8.3f} {r["p50"]:>8.3f} {r["p90"]:>8.3f} {r["p99"]:>8.3f} {r["max"]:>8.3f} {r["gc_collections"]:>5} {r["peak_alloc_kb_per_frame"]:>11.1f} {r["memory_growth_kb"]:>10.1f}')
+    return '\n'.join(lines)
+
+
+def compare(results, baseline, tolerance=.2, key='p50'):
+    '''Returns a list of (name, baseline_value, new_value) for scenarios that got more than tolerance slower than the baseline.'''
+    regressions = []
+    for name, r in results.items():
+        if name not in baseline:
+            continue
+        if r[key] > baseline[name][key] * (1 + tolerance):
+            regressions.append((name, baseline[name][key], r[key]))
+    return regressions
+
+
+
+if __name__ == '__main__':
+    names = None
+    frames = 300
+    json_path = None
+    baseline_path = None
+    tolerance = .2
+    allocations = True
+
+    for arg in sys.argv[1:]:
+        if arg == '--help':
+            print(dedent(f'''
+                runs engine benchmarks headless (window_type='none') with a fixed time.dt
+                and prints per-frame timing percentiles and allocations.
+
+                --scenarios=*       # comma separated, default is all: {",".join(scenarios.keys())}
+                --frames=300        # frames to measure per scenario
+                --json=*            # save results to a json file
+                --baseline=*        # compare against results saved with --json. exits with code 1 if something got slower.
+                --tolerance=.2      # how much slower than the baseline is allowed
+                --no_allocations    # skip the tracemalloc pass
+                '''))
+            sys.exit()
+
+        elif arg.startswith('--scenarios='):
+            names = arg.split('=')[1].split(',')
+        elif arg.startswith('--frames='):
+            frames = int(arg.split('=')[1])
+        elif arg.startswith('--json='):
+            json_path = Path(arg.split('=')[1])
+        elif arg.startswith('--baseline='):
+            baseline_path = Path(arg.split('=')[1])
+        elif arg.startswith('--tolerance='):
+            tolerance = float(arg.split('=')[1])
+        elif arg == '--no_allocations':
+            allocations = False
+
+    results = run(names, frames=frames, allocations=allocations)
+
+    if json_path:
+        json_path.write_text(json.dumps(results, indent=4))
+        print('saved results to:', json_path)
+
+    if baseline_path:
+        regressions = compare(results, json.loads(baseline_path.read_text()), tolerance=tolerance)
+        for name, old, new in regressions:
+            print(f'regression: {name} p50 went from {old:.3f} ms to {new:.3f} ms')
+        if regressions:
+            sys.exit(1)
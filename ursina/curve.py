@@ -1,6 +1,7 @@
 '''Translated from https://github.com/AndrewRayCode/easing-utils/blob/master/src/easing.js'''
 
 from math import cos, pi, sqrt, sin, asin, floor
+import bisect
 
 
 def linear(t):
@@ -64,7 +65,7 @@ def in_out_quart(t):
     if t < .5:
         return 8 * t * t * t * t
     else:
-        1 - 8 * t1 * t1 * t1 * t1
+        return 1 - 8 * t1 * t1 * t1 * t1
 
 
 def in_quint(t):
@@ -237,11 +238,13 @@ def combine(curve_a, curve_b, split_at):
             return curve_a(t / split_at)
         else:
             return curve_b(min((t / (1-split_at)) - split_at, 1))
+    _new_curve_func._combine = (curve_a, curve_b, split_at)   # so vectorize() can combine the vectorized versions
     return _new_curve_func
 
 def reverse(curve_function):
     def _new_curve_func(t):
         return curve_function(1-t)
+    _new_curve_func._reverse = curve_function
     return _new_curve_func
 
 
@@ -258,18 +261,21 @@ for e in dir(sys.modules[__name__]):
                     return {e}(t*2)
                 else:
                     return {e}(1-((t-.5)*2))
+            {e}_boomerang._boomerang_of = {e}
         '''))
 
 
 # bezier code is translated  from WebKit implementation
 class CubicBezier:
-    __slots__ = ['a', 'b', 'c', 'd', 'cx', 'bx', 'ax', 'cy', 'by', 'ay']
+    __slots__ = ['a', 'b', 'c', 'd', 'cx', 'bx', 'ax', 'cy', 'by', 'ay', 'lookup_table']
+    _lookup_tables = dict()     # (a, b, c, d, size): table, shared between CubicBeziers with the same control points
 
-    def __init__(self, a, b, c, d):
+    def __init__(self, a, b, c, d, lookup_table_size=0):
         self.a = a
         self.b = b
         self.c = c
         self.d = d
+        self.lookup_table = None
         # pre-calculate the polynomial coefficients
         # irst and last control points are implied to be (0,0) and (1.0, 1.0)
         self.cx = 3.0 * a
@@ -280,6 +286,34 @@ class CubicBezier:
         self.by = 3.0 * (d - b) - self.cy
         self.ay = 1.0 - self.cy - self.by
 
+        if lookup_table_size:
+            self.build_lookup_table(lookup_table_size)
+
+    def build_lookup_table(self, size=256):    # sample the curve once, so calling it afterwards is a lookup instead of solving for x every time
+        # samples are spaced evenly along the curve instead of along x, so steep parts get as many as flat parts
+        key = (self.a, self.b, self.c, self.d, size)
+        if key not in CubicBezier._lookup_tables:
+            steps = [i / (size-1) for i in range(size)]
+            CubicBezier._lookup_tables[key] = (tuple(self.sample_curve_x(e) for e in steps), tuple(self.sample_curve_y(e) for e in steps))
+        self.lookup_table = CubicBezier._lookup_tables[key]
+        return self.lookup_table
+
+    def __call__(self, t):  # so it can be used as a curve, like curve.in_expo
+        if self.lookup_table is None:
+            return self.calculate(t)
+        xs, ys = self.lookup_table
+        if t <= xs[0]:
+            return ys[0]
+        if t >= xs[-1]:
+            return ys[-1]
+        i = bisect.bisect_left(xs, t)
+        return ys[i-1] + (ys[i] - ys[i-1]) * (t - xs[i-1]) / (xs[i] - xs[i-1])
+
+    def vectorized(self, t):    # same as calling it, but for a numpy array of t. builds a lookup table if there isn't one.
+        import numpy as np
+        xs, ys = self.lookup_table if self.lookup_table is not None else self.build_lookup_table()
+        return np.interp(t, xs, ys)
+
     def sample_curve_x(self, t):
         return ((self.ax * t + self.bx) * t + self.cx) * t
 
@@ -337,6 +371,147 @@ class CubicBezier:
         return t2
 
 
+_vectorized = None  # curve: the same curve for numpy arrays. gets filled in the first time vectorize() is called, so numpy only gets imported if it's used.
+
+def _build_vectorized():
+    import numpy as np
+    where, sqrt_, sin_, cos_, power = np.where, np.sqrt, np.sin, np.cos, np.power
+
+    def positive_sqrt(x):   # both sides of where() get calculated, so avoid nans from the side that doesn't get used
+        return sqrt_(np.maximum(x, 0))
+
+    def elastic(t, value):
+        return where((t == 0) | (t == 1), t, value)
+
+    def _in_elastic(t, magnitude=.7):
+        p = 1 - magnitude
+        s = p / (2 * pi) * asin(1)
+        t1 = t - 1
+        return elastic(t, -(power(2, 10 * t1) * sin_((t1 - s) * (2 * pi) / p)))
+
+    def _out_elastic(t, magnitude=.7):
+        p = 1 - magnitude
+        s = p / (2 * pi) * asin(1)
+        scaled_time = t * 2
+        return elastic(t, power(2, -10 * scaled_time) * sin_((scaled_time - s) * (2 * pi) / p) + 1)
+
+    def _in_out_elastic(t, magnitude=.65):
+        p = 1 - magnitude
+        s = p / (2 * pi) * asin(1)
+        t1 = t * 2 - 1
+        wave = sin_((t1 - s) * (2 * pi) / p)
+        return elastic(t, where(t1 < 0, -.5 * power(2, 10 * t1) * wave, power(2, -10 * t1) * wave * .5 + 1))
+
+    def _out_bounce(t):
+        return np.select(
+            (t < 1 / 2.75, t < 2 / 2.75, t < 2.5 / 2.75),
+            (7.5625 * t * t, 7.5625 * (t - 1.5/2.75)**2 + .75, 7.5625 * (t - 2.25/2.75)**2 + .9375),
+            7.5625 * (t - 2.625/2.75)**2 + .984375
+            )
+
+    def _in_bounce(t):
+        return 1 - _out_bounce(1 - t)
+
+    def _in_out_back(t, magnitude=1.70158):
+        s = magnitude * 1.525
+        t1 = t * 2
+        t2 = t1 - 2
+        return where(t1 < 1, .5 * t1 * t1 * ((s + 1) * t1 - s), .5 * (t2 * t2 * ((s + 1) * t2 + s) + 2))
+
+    return {
+        linear: lambda t: t,
+        in_sine: lambda t: -cos_(t * (pi / 2)) + 1,
+        out_sine: lambda t: sin_(t * (pi / 2)),
+        in_out_sine: lambda t: -.5 * (cos_(pi * t) - 1),
+        in_quad: lambda t: t * t,
+        out_quad: lambda t: t * (2 - t),
+        in_out_quad: lambda t: where(t < .5, 2 * t * t, -1 + (4 - 2 * t) * t),
+        in_cubic: lambda t: t * t * t,
+        out_cubic: lambda t: (t - 1)**3 + 1,
+        in_out_cubic: lambda t: where(t < .5, 4 * t * t * t, (t - 1) * (2 * t - 2) * (2 * t - 2) + 1),
+        in_quart: lambda t: t**4,
+        out_quart: lambda t: 1 - (t - 1)**4,
+        in_out_quart: lambda t: where(t < .5, 8 * t**4, 1 - 8 * (t - 1)**4),
+        in_quint: lambda t: t**5,
+        out_quint: lambda t: 1 + (t - 1)**5,
+        in_out_quint: lambda t: where(t < .5, 16 * t**5, 1 + 16 * (t - 1)**5),
+        in_expo: lambda t: power(2, 10 * (t - 1)),
+        out_expo: lambda t: -power(2, -10 * t) + 1,
+        in_out_expo: lambda t: where(t < .5, .5 * power(2, 10 * (t * 2 - 1)), .5 * (-power(2, -10 * (t * 2 - 1)) + 2)),
+        in_circ: lambda t: -(positive_sqrt(1 - t * t) - 1),
+        out_circ: lambda t: positive_sqrt(1 - (t - 1)**2),
+        in_out_circ: lambda t: where(t < .5, -.5 * (positive_sqrt(1 - (t * 2)**2) - 1), .5 * (positive_sqrt(1 - (t * 2 - 2)**2) + 1)),
+        in_back: lambda t: t * t * ((1.70158 + 1) * t - 1.70158),
+        out_back: lambda t: (t - 1)**2 * ((1.70158 + 1) * (t - 1) + 1.70158) + 1,
+        in_out_back: _in_out_back,
+        in_elastic: _in_elastic,
+        out_elastic: _out_elastic,
+        in_out_elastic: _in_out_elastic,
+        out_bounce: _out_bounce,
+        in_bounce: _in_bounce,
+        in_out_bounce: lambda t: where(t < .5, _in_bounce(t * 2) * .5, _out_bounce(t * 2 - 1) * .5 + .5),
+        zero: lambda t: np.zeros_like(t),
+        one: lambda t: np.ones_like(t),
+        }
+
+
+def vectorize(curve_function):
+    '''Returns a version of the curve that takes a numpy array of t and returns an array, for evaluating lots of values at once.
+    Works for the curves in this module, their _boomerang versions, combine(), reverse() and CubicBezier.
+    Other functions are used as they are if they work on arrays, otherwise they get called once per value.
+
+        vectorize(curve.out_bounce)(np.linspace(0, 1, 100))
+    '''
+    import numpy as np
+    global _vectorized
+    if _vectorized is None:
+        _vectorized = _build_vectorized()
+
+    if curve_function is None:
+        return _vectorized[linear]
+
+    if curve_function in _vectorized:
+        return _vectorized[curve_function]
+
+    if isinstance(curve_function, CubicBezier):
+        return curve_function.vectorized
+
+    if hasattr(curve_function, '_boomerang_of'):
+        f = vectorize(curve_function._boomerang_of)
+        return lambda t: f(np.where(t < .5, t * 2, 1 - ((t - .5) * 2)))
+
+    if hasattr(curve_function, '_reverse'):
+        f = vectorize(curve_function._reverse)
+        return lambda t: f(1 - t)
+
+    if hasattr(curve_function, '_combine'):
+        curve_a, curve_b, split_at = curve_function._combine
+        a, b = vectorize(curve_a), vectorize(curve_b)
+        def _combined(t):
+            t = np.asarray(t, dtype=float)
+            result = np.empty_like(t)
+            first = t < split_at
+            result[first] = a(t[first] / split_at)
+            result[~first] = b(np.minimum((t[~first] / (1-split_at)) - split_at, 1))
+            return result
+        return _combined
+
+    def per_value(t):
+        return np.fromiter((curve_function(e) for e in np.asarray(t).tolist()), dtype=float, count=np.size(t))
+
+    # custom curves written with plain math might work on arrays as they are
+    test = np.linspace(0, 1, 7)
+    try:
+        with np.errstate(all='ignore'):
+            result = curve_function(test)
+        if isinstance(result, np.ndarray) and result.shape == test.shape and np.allclose(result, per_value(test), equal_nan=True):
+            return curve_function
+    except Exception:
+        pass
+    return per_value
+
+
+
 if __name__ == '__main__':
     '''Draws a sheet with every curve and its name'''
     from ursina import *
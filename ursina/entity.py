@@ -1,6 +1,9 @@
 import ursina
+import sys
 import builtins
+import linecache
 from pathlib import Path
+from itertools import count
 from panda3d.core import NodePath
 from ursina.vec2 import Vec2
 from ursina.vec3 import Vec3
@@ -20,8 +23,8 @@ from ursina.mesh import Mesh
 from ursina.sequence import Sequence, Func, Wait
 from ursina.ursinamath import lerp
 from ursina import curve
-from ursina.mesh_importer import load_model
-from ursina.texture_importer import load_texture
+from ursina.mesh_importer import load_model, imported_meshes
+from ursina.texture_importer import load_texture, load_texture_async, imported_textures
 from ursina.string_utilities import camel_to_snake
 from textwrap import dedent
 from panda3d.core import Shader as Panda3dShader
@@ -30,6 +33,10 @@ from ursina.shader import Shader
 from ursina.string_utilities import print_warning
 from ursina.ursinamath import Bounds
 from ursina.ursinastuff import invoke, PostInitCaller
+from ursina.scripts import update_lod, async_loader, coroutines, static_flattening
+from ursina.scripts.tween_engine import Tween, numpy_available
+from ursina.scripts.timers import Timer
+from ursina.scripts.ordered_set import OrderedSet
 
 from ursina import color
 from ursina.color import Color
@@ -41,60 +48,67 @@ except:
 _Ursina_instance = None
 _warn_if_ursina_not_instantiated = True # gets set to True after Ursina.__init__() to ensure the correct order.
 
+
+class _ClassInfo:
+    '''Things Entity.__init__() needs to know about a class, worked out once the first time it gets instantiated.'''
+    __slots__ = ('name', 'types', 'every_methods', 'every_version')
+
+    def __init__(self, cls):
+        from inspect import getmro
+        self.name = camel_to_snake(cls.__name__)
+        self.types = tuple(c.__name__ for c in getmro(cls))
+        self.every_version = -1     # len(every.decorated_methods) when every_methods was found, since more can get decorated later
+
+    def get_every_methods(self):
+        from ursina.scripts.every_decorator import every, get_class_name
+        if self.every_version != len(every.decorated_methods):
+            self.every_methods = tuple(method for method in every.decorated_methods if get_class_name(method._func) == self.types[0])
+            self.every_version = len(every.decorated_methods)
+        return self.every_methods
+
+_class_infos = dict()   # class: _ClassInfo
+
 from ursina.scripts.property_generator import generate_properties_for_class
 @generate_properties_for_class()
 class Entity(NodePath, metaclass=PostInitCaller):
     rotation_directions = (-1,-1,1)
     default_shader = None
+    async_load = False  # if True, models and textures set with a name get loaded in the background, showing a placeholder until they're done
+    _static_root = None # the closest static ancestor, which needs to know when this entity changes
+    _scene_order_counter = count()   # used to keep scene.handlers in the same order as scene.entities
     default_values = {
         # 'parent':scene,
         'name':'entity', 'enabled':True, 'eternal':False, 'position':Vec3(0,0,0), 'rotation':Vec3(0,0,0), 'scale':Vec3(1,1,1), 'model':None, 'origin':Vec3(0,0,0),
         'shader':None, 'texture':None, 'texture_scale':Vec2(1,1), 'color':color.white, 'collider':None}
 
+    _first_keys = ('async_load', 'model', 'origin', 'origin_x', 'origin_y', 'origin_z', 'collider', 'shader', 'texture', 'texture_scale', 'texture_offset')
+
     def __init__(self, add_to_scene_entities=True, enabled=True, **kwargs):
-        self._children = []
+        self._children = OrderedSet()
         super().__init__(self.__class__.__name__)
 
-        self.name = camel_to_snake(self.__class__.__name__)
+        class_info = _class_infos.get(self.__class__)
+        if class_info is None:
+            class_info = _class_infos[self.__class__] = _ClassInfo(self.__class__)
+
+        self.name = class_info.name
         self.ignore = False     # if True, will not try to run code.
         self.ignore_paused = False      # if True, will still run when application is paused. useful when making a pause menu for example.
         self.ignore_input = False
 
         self.parent = scene     # default parent is scene, which means it's in 3d space. to use UI space, set the parent to camera.ui instead.
+        self.scripts = []   # add with add_script(class_instance). will assign an 'entity' variable to the script.
         self.add_to_scene_entities = add_to_scene_entities # set to False to be ignored by the engine, but still get rendered.
-        if add_to_scene_entities:
-            scene.entities.append(self)
 
         self._shader_inputs = {}
         if Entity.default_shader:
             self.shader = Entity.default_shader
 
         self.setPythonTag('Entity', self)   # for the raycast to get the Entity and not just the NodePath
-        self.scripts = []   # add with add_script(class_instance). will assign an 'entity' variable to the script.
         self.animations = []
         self.hovered = False    # will return True if mouse hovers entity.
-        self.line_definition = None # returns a Traceback(filename, lineno, function, code_context, index).
-
         if application.trace_entity_definition and add_to_scene_entities or (not _Ursina_instance and _warn_if_ursina_not_instantiated and add_to_scene_entities):
-            from inspect import getframeinfo, stack
-            _stack = stack()
-            caller = getframeinfo(_stack[1][0])
-            if len(_stack) > 2 and _stack[1].code_context and 'super().__init__()' in _stack[1].code_context[0]:
-                caller = getframeinfo(_stack[3][0])
-
-            self.line_definition = caller
-            if caller.code_context:
-                self.code_context = caller.code_context[0]
-
-                if (self.code_context.count('(') == self.code_context.count(')') and
-                ' = ' in self.code_context and 'name=' not in self.code_context
-                and 'Ursina()' not in self.code_context):
-
-                    self.name = self.code_context.split(' = ')[0].strip().replace('self.', '')
-                    # print('set name to:', self.code_context.split(' = ')[0].strip().replace('self.', ''))
-
-                if application.print_entity_definition:
-                    print(f'{Path(caller.filename).name} ->  {caller.lineno} -> {caller.code_context}')
+            self._trace_definition()
 
 
         if not _Ursina_instance and _warn_if_ursina_not_instantiated and add_to_scene_entities:
@@ -102,22 +116,51 @@ class Entity(NodePath, metaclass=PostInitCaller):
 
 
         # make sure things get set in the correct order. both colliders and texture need the model to be set first.
-        for key in ('model', 'origin', 'origin_x', 'origin_y', 'origin_z', 'collider', 'shader', 'texture', 'texture_scale', 'texture_offset'):
-            if key in kwargs:
-                setattr(self, key, kwargs[key])
-                del kwargs[key]
+        if kwargs and not kwargs.keys().isdisjoint(Entity._first_keys):
+            for key in Entity._first_keys:
+                if key in kwargs:
+                    setattr(self, key, kwargs[key])
+                    del kwargs[key]
 
         for key, value in kwargs.items():
             setattr(self, key, value)
 
         self.enabled = enabled
 
-        # look for @every decorator and start a looping Sequence for decorated method
-        from ursina.scripts.every_decorator import every, get_class_name
-        for method in every.decorated_methods:
-            if get_class_name(method._func) == self.types[0]:
-                self.animations.append(Sequence(Func(method, self), Wait(method._every.interval), loop=True, started=True, entity=self))
-                print('append to animations:', self)
+        # start a repeating Timer for methods with the @every decorator
+        for method in class_info.get_every_methods():
+            self.animations.append(Timer(method, (self, ), interval=method._every.interval, entity=self).start())
+
+
+    def _trace_definition(self):   # remember where the entity was created. only reads the lines it needs, instead of inspect.stack() reading the source of every frame.
+        frame = sys._getframe(2)    # the caller of __init__()
+        if 'super().__init__()' in linecache.getline(frame.f_code.co_filename, frame.f_lineno) and frame.f_back and frame.f_back.f_back:
+            frame = frame.f_back.f_back
+
+        self._line_definition = (frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name)
+        code_context = linecache.getline(frame.f_code.co_filename, frame.f_lineno)
+        if code_context:
+            self.code_context = code_context
+
+            if (self.code_context.count('(') == self.code_context.count(')') and
+            ' = ' in self.code_context and 'name=' not in self.code_context
+            and 'Ursina()' not in self.code_context):
+
+                self.name = self.code_context.split(' = ')[0].strip().replace('self.', '')
+                # print('set name to:', self.code_context.split(' = ')[0].strip().replace('self.', ''))
+
+            if application.print_entity_definition:
+                print(f'{Path(frame.f_code.co_filename).name} ->  {frame.f_lineno} -> {[code_context]}')
+
+    def line_definition_getter(self):  # returns a Traceback(filename, lineno, function, code_context, index) if application.trace_entity_definition was on when the entity was created.
+        if getattr(self, '_line_definition', None) is None:
+            return None
+        from inspect import Traceback
+        filename, lineno, function = self._line_definition
+        return Traceback(filename, lineno, function, [linecache.getline(filename, lineno)], 0)
+
+    def line_definition_setter(self, value):
+        self._line_definition = (value.filename, value.lineno, value.function) if value else None
 
 
     def __post_init__(self):
@@ -170,7 +213,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
             self.on_disable()
 
         if value:
-            if hasattr(self, 'is_singleton') and not self.is_singleton():
+            if not original_value and hasattr(self, 'is_singleton') and not self.is_singleton():   # already unstashed if it was enabled
                 self.unstash()
         else:
             if hasattr(self, 'is_singleton') and not self.is_singleton():
@@ -179,9 +222,113 @@ class Entity(NodePath, metaclass=PostInitCaller):
         for loose_child in self.loose_children:
             loose_child.enabled = value
 
+        self._update_enabled_in_hierarchy()
+        self._invalidate_static()
+
+
+    @property
+    def enabled_in_hierarchy(self):    # False if the entity or any of its ancestors is disabled. cached, so it's cheap to check every frame.
+        return getattr(self, '_enabled_in_hierarchy', self.enabled)
+
+    def _update_enabled_in_hierarchy(self):    # recalculate the cached state and pass it on to the children, but only if it changed.
+        value = self.enabled and getattr(getattr(self, '_parent', None), '_enabled_in_hierarchy', True)
+        if value == getattr(self, '_enabled_in_hierarchy', None):
+            return
+
+        self._enabled_in_hierarchy = value
+        self._update_handler_registration()
+        for c in self.children:
+            c._update_enabled_in_hierarchy()
+
+
+    def add_to_scene_entities_getter(self):
+        return getattr(self, '_add_to_scene_entities', False)
+
+    def add_to_scene_entities_setter(self, value):  # set to False to be ignored by the engine, but still get rendered.
+        if value and not self.add_to_scene_entities:
+            self._scene_order = next(Entity._scene_order_counter)
+            scene.entities.append(self)
+        elif not value and self in scene.entities:
+            scene.entities.remove(self)
+
+        self._add_to_scene_entities = value
+        self._update_handler_registration()
+
+
+    def _has_handler(self, name):
+        if callable(getattr(self, name, None)) or any(callable(getattr(script, name, None)) for script in self.scripts):
+            return True
+        return name == 'update' and isinstance(self.shader, Shader) and bool(self.shader.continuous_input)
+
+    def _update_handler_registration(self):  # keep scene.handlers up to date, so only entities that actually have an update/fixed_update/input/text_input get called by the engine.
+        active = self.add_to_scene_entities and self.enabled_in_hierarchy
+        if not active and not getattr(self, '_registered', False):    # nothing to unregister, e.g. while still in __init__
+            return
+        self._registered = active
+        throttled = getattr(self, '_update_lod', None)
+        for name, handlers in scene.handlers.items():
+            if active and self._has_handler(name) and not (throttled and name == 'update'):
+                handlers.add(self)
+            else:
+                handlers.discard(self)
+
+        if throttled:   # update gets called by the update_lod scheduler instead
+            if active and self._has_handler('update'):
+                update_lod.scheduler.add(self)
+            else:
+                update_lod.scheduler.discard(self)
+
+    def _handler_getter(self, name):
+        if hasattr(self, f'_{name}'):   # assigned on the instance, e.g. Entity(update=some_function)
+            return getattr(self, f'_{name}')
+        return getattr(super(Entity, self), name, None)   # the property would hide methods from classes after Entity in the mro, like a mixin in class Player(Entity, Mixin)
+
+    # assigning these will register/unregister the entity, e.g. Entity(update=some_function) or entity.input = None
+    def update_getter(self):
+        return self._handler_getter('update')
+
+    def update_setter(self, value):
+        self._update = value
+        self._update_handler_registration()
+
+    def update_lod_setter(self, value):    # assign an UpdateLOD to call update() less often the further away the entity is.
+        update_lod.scheduler.discard(self)
+        self._update_lod = value
+        self._update_handler_registration()
+
+    def fixed_update_getter(self):
+        return self._handler_getter('fixed_update')
+
+    def fixed_update_setter(self, value):
+        self._fixed_update = value
+        self._update_handler_registration()
+
+    def input_getter(self):
+        return self._handler_getter('input')
+
+    def input_setter(self, value):
+        self._input = value
+        self._update_handler_registration()
+
+    def text_input_getter(self):
+        return self._handler_getter('text_input')
+
+    def text_input_setter(self, value):
+        self._text_input = value
+        self._update_handler_registration()
+
+    def scripts_getter(self):
+        return getattr(self, '_scripts', [])
+
+    def scripts_setter(self, value):
+        self._scripts = value
+        self._update_handler_registration()
+
 
 
     def model_setter(self, value):  # set model with model='model_name' (without file type extension)
+        self._invalidate_static()
+        self._async_model_name = None   # so a model that's still loading in the background won't replace this one
         if value is None:
             if self.model:
                 self.model.removeNode()
@@ -195,6 +342,10 @@ class Entity(NodePath, metaclass=PostInitCaller):
             self._model = value
 
         elif isinstance(value, str): # pass model asset name
+            if self.async_load and value not in imported_meshes:
+                self._load_model_async(value)
+                return
+
             m = load_model(value, application.asset_folder)
             if not m:
                 m = load_model(value, application.internal_models_compressed_folder)
@@ -216,14 +367,51 @@ class Entity(NodePath, metaclass=PostInitCaller):
                 return
 
         if self._model:
-            self._model.reparentTo(self)
-            self._model.setTransparency(TransparencyAttrib.M_dual)
-            self.color = self.color # reapply color after changing model
-            self.texture = self.texture # reapply texture after changing model
-            self._vert_cache = None
-            if isinstance(value, Mesh):
-                if hasattr(value, 'on_assign'):
-                    value.on_assign(assigned_to=self)
+            self._apply_model()
+
+
+    def _apply_model(self):    # parent the model that was just put in self._model and reapply what depends on it. also used by spawn_many().
+        self._model.reparentTo(self)
+        self._model.setTransparency(TransparencyAttrib.M_dual)
+        self.color = self.color # reapply color after changing model
+        loading_texture = getattr(self, '_async_texture_name', None)
+        self.texture = self.texture # reapply texture after changing model
+        self._async_texture_name = loading_texture  # reapplying shouldn't cancel a texture that's loading in the background
+        self._vert_cache = None
+        if isinstance(self._model, Mesh):
+            if hasattr(self._model, 'on_assign'):
+                self._model.on_assign(assigned_to=self)
+
+
+    def _load_model_async(self, name):
+        if async_loader.placeholder_model:
+            self.model = load_model(async_loader.placeholder_model, application.internal_models_compressed_folder)
+        self._async_model_name = name
+
+        def find_model():
+            return load_model(name, application.asset_folder) or load_model(name, application.internal_models_compressed_folder)
+
+        def on_loaded(m):
+            if not self or self._async_model_name != name:    # got destroyed or another model got assigned while loading
+                return
+            if not m:
+                if self.model:  # don't leave the placeholder. only detach it, since model=None would remove the node it shares with the model cache
+                    self.model.detachNode()
+                    self._model = None
+                if application.raise_exception_on_missing_model:
+                    raise ValueError(f"missing model: '{name}'")
+                print_warning(f"missing model: '{name}'")
+                return
+
+            m.name = name
+            self.model = m
+            self.origin = self.origin
+            if self.shader:
+                self.shader = self.shader
+            if self.collider and self.collider.name in ('box', 'mesh'):  # refit to the new model
+                self.collider = self.collider.name
+
+        async_loader.submit(find_model, callback=on_loaded)
 
 
     def color_getter(self):
@@ -242,6 +430,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
             # print('SET COLOR TO', value, self.name)
             self.model.setColorScaleOff() # prevent inheriting color from parent
             self.model.setColorScale(value)
+        self._invalidate_static()
 
 
     def eternal_getter(self):
@@ -256,6 +445,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
     def double_sided_setter(self, value):
         self._double_sided = value
         self.setTwoSided(value)
+        self._invalidate_static()
 
 
     def render_queue_getter(self):
@@ -265,14 +455,17 @@ class Entity(NodePath, metaclass=PostInitCaller):
         self._render_queue = value
         if self.model:
             self.model.setBin('fixed', value)
+        self._invalidate_static()
 
 
     def parent_setter(self, value):
-        if hasattr(self, '_parent') and self._parent and hasattr(self._parent, '_children') and self in self._parent._children:
-            self._parent._children.remove(self)
+        old_parent = getattr(self, '_parent', None)
+        if old_parent is not value: # only touch the children lists when the parent changes, since searching them gets slow with many children
+            if old_parent and hasattr(old_parent, '_children') and self in old_parent._children:
+                old_parent._children.remove(self)
 
-        if hasattr(value, '_children') and self not in value._children:
-            value._children.append(self)
+            if hasattr(value, '_children'):
+                value._children.append(self)
 
         self._parent = value
         if value is None:
@@ -281,6 +474,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
         #     value = scene
         self.reparent_to(value)
         self.enabled = self.enabled   # parenting will undo the .stash() done when setting .enabled to False, so reapply it here
+        self._update_static_root()
 
 
     def loose_parent_getter(self):
@@ -308,14 +502,49 @@ class Entity(NodePath, metaclass=PostInitCaller):
             value._children.append(self)
 
         self.wrtReparentTo(value)
-        self.enabled = self._enabled   # parenting will undo the .stash() done when setting .enabled to False, so reapply it here
         self._parent = value
+        self.enabled = self._enabled   # parenting will undo the .stash() done when setting .enabled to False, so reapply it here
+        self._update_static_root()
+
+
+    def static_getter(self):
+        return getattr(self, '_static', False)
+
+    def static_setter(self, value):    # render the children as one flattened copy. changing any of them splits it up again until they stop changing. see static_flattening.py
+        if value == self.static:
+            return
+        self._static = value
+        static_flattening.scheduler.set_static(self, value)
+
+    def _invalidate_static(self):  # call after changing anything that's visible in the flattened copy of a static ancestor, so it gets split up and rebuilt
+        if self._static_root is not None:
+            static_flattening.scheduler.invalidate(self._static_root)
+
+    def _update_static_root(self):     # called after changing parent
+        old_root = self._static_root
+        parent = self._parent
+        if not isinstance(parent, Entity):  # can be a plain NodePath, or a Mesh, which has its own unrelated .static
+            new_root = None
+        else:
+            new_root = parent if parent.static else parent._static_root
+        if old_root is None and new_root is None:
+            return
+        if old_root is not None:
+            static_flattening.scheduler.invalidate(old_root)
+        if new_root is not old_root:
+            self._static_root = new_root
+            if not self.static:
+                static_flattening.mark(self, new_root)
+        if new_root is not None:
+            static_flattening.scheduler.invalidate(new_root)
 
 
     @property
     def types(self): # get all class names including those this inhertits from.
-        from inspect import getmro
-        return [c.__name__ for c in getmro(self.__class__)]
+        class_info = _class_infos.get(self.__class__)
+        if class_info is None:
+            class_info = _class_infos[self.__class__] = _ClassInfo(self.__class__)
+        return list(class_info.types)
 
 
     def visible_getter(self):
@@ -327,11 +556,13 @@ class Entity(NodePath, metaclass=PostInitCaller):
             self.show()
         else:
             self.hide()
+        self._invalidate_static()
 
     def visible_self_getter(self): # set visibility of self, without affecting children.
         return getattr(self, '_visible_self', True)
 
     def visible_self_setter(self, value):
+        self._invalidate_static()
         self._visible_self = value
         if not self.model:
             return
@@ -438,6 +669,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
 
         if self.model:
             self.model.setPos(-value[0], -value[1], -value[2])
+        self._invalidate_static()
 
 
     def origin_x_getter(self):
@@ -465,6 +697,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
             value = Vec3(*value, self.z)
 
         self.setPos(scene, Vec3(value[0], value[1], value[2]))
+        self._invalidate_static()
 
     def world_x_getter(self):
         return self.getX(scene)
@@ -475,10 +708,13 @@ class Entity(NodePath, metaclass=PostInitCaller):
 
     def world_x_setter(self, value):
         self.setX(scene, value)
+        self._invalidate_static()
     def world_y_setter(self, value):
         self.setY(scene, value)
+        self._invalidate_static()
     def world_z_setter(self, value):
         self.setZ(scene, value)
+        self._invalidate_static()
 
     def position_getter(self):
         return Vec3(*self.getPos())
@@ -490,21 +726,25 @@ class Entity(NodePath, metaclass=PostInitCaller):
             value = Vec3(*value, self.z)
 
         self.setPos(value[0], value[1], value[2])
+        self._invalidate_static()
 
     def x_getter(self):
         return self.getX()
     def x_setter(self, value):
         self.setX(value)
+        self._invalidate_static()
 
     def y_getter(self):
         return self.getY()
     def y_setter(self, value):
         self.setY(value)
+        self._invalidate_static()
 
     def z_getter(self):
         return self.getZ()
     def z_setter(self, value):
         self.setZ(value)
+        self._invalidate_static()
 
     @property
     def X(self):    # shortcut for int(entity.x)
@@ -522,6 +762,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
 
     def world_rotation_setter(self, value):
         self.setHpr(scene, Vec3(value[1], value[0], value[2]) * Entity.rotation_directions)
+        self._invalidate_static()
 
     def world_rotation_x_getter(self):
         return self.world_rotation[0]
@@ -552,6 +793,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
             value = Vec3(*value, self.rotation_z)
 
         self.setHpr(Vec3(value[1], value[0], value[2]) * Entity.rotation_directions)
+        self._invalidate_static()
 
     def rotation_x_getter(self):
         return self.rotation.x
@@ -572,6 +814,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
         return self.get_quat()
     def quaternion_setter(self, value):
         self.set_quat(value)
+        self._invalidate_static()
 
     def world_scale_getter(self):
         return Vec3(*self.getScale(scene))
@@ -582,21 +825,25 @@ class Entity(NodePath, metaclass=PostInitCaller):
             value = Vec3(*value, self.scale_z)
 
         self.setScale(scene, value)
+        self._invalidate_static()
 
     def world_scale_x_getter(self):
         return self.getScale(scene)[0]
     def world_scale_x_setter(self, value):
         self.setScale(scene, Vec3(value, self.world_scale_y, self.world_scale_z))
+        self._invalidate_static()
 
     def world_scale_y_getter(self):
         return self.getScale(scene)[1]
     def world_scale_y_setter(self, value):
         self.setScale(scene, Vec3(self.world_scale_x, value, self.world_scale_z))
+        self._invalidate_static()
 
     def world_scale_z_getter(self):
         return self.getScale(scene)[2]
     def world_scale_z_setter(self, value):
         self.setScale(scene, Vec3(self.world_scale_x, self.world_scale_y, value))
+        self._invalidate_static()
 
     def scale_getter(self):
         scale = self.getScale()
@@ -610,21 +857,25 @@ class Entity(NodePath, metaclass=PostInitCaller):
 
         value = [e if e!=0 else .001 for e in value]
         self.setScale(value[0], value[1], value[2])
+        self._invalidate_static()
 
     def scale_x_getter(self):
         return self.scale[0]
     def scale_x_setter(self, value):
         self.setScale(value, self.scale_y, self.scale_z)
+        self._invalidate_static()
 
     def scale_y_getter(self):
         return self.scale[1]
     def scale_y_setter(self, value):
         self.setScale(self.scale_x, value, self.scale_z)
+        self._invalidate_static()
 
     def scale_z_getter(self):
         return self.scale[2]
     def scale_z_setter(self, value):
         self.setScale(self.scale_x, self.scale_y, value)
+        self._invalidate_static()
 
     def transform_getter(self): # get/set position, rotation and scale
         return (self.position, self.rotation, self.scale)
@@ -669,7 +920,9 @@ class Entity(NodePath, metaclass=PostInitCaller):
 
 
     def shader_setter(self, value):
+        self._invalidate_static()
         self._shader = value
+        self._update_handler_registration()    # shaders with continuous_input get updated every frame
         if not self.model:
             return
 
@@ -691,6 +944,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
 
         if isinstance(value, Shader):
             self._shader = value
+            self._update_handler_registration()
             if not value.compiled:
                 value.compile()
 
@@ -737,6 +991,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
 
 
     def texture_setter(self, value):    # set model with texture='texture_name'. requires a model to be set beforehand.
+        self._invalidate_static()
         if value is None and self.texture:
             # print('remove texture')
             self._texture = None
@@ -744,6 +999,11 @@ class Entity(NodePath, metaclass=PostInitCaller):
                 self.model.clearTexture()
             return
 
+        self._async_texture_name = None
+        if isinstance(value, str) and self.async_load and value not in imported_textures:
+            self._load_texture_async(value)
+            return
+
         if isinstance(value, str):
             texture_name = value
             value = load_texture(value)
@@ -769,6 +1029,23 @@ class Entity(NodePath, metaclass=PostInitCaller):
             self.model.setTexture(value._texture, 1)
 
 
+    def _load_texture_async(self, name):
+        self.texture = async_loader.placeholder_texture
+        self._async_texture_name = name
+
+        def on_loaded(texture):
+            if not self or self._async_texture_name != name:
+                return
+            if texture is None:
+                if application.raise_exception_on_missing_texture:
+                    raise ValueError(f"missing texture: '{name}'")
+                print_warning(f"missing texture: '{name}'")
+                return
+            self.texture = texture
+
+        load_texture_async(name, callback=on_loaded)
+
+
     def texture_scale_getter(self):
         if 'texture_scale' in self._shader_inputs:
             return self._shader_inputs['texture_scale']
@@ -780,6 +1057,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
         if self.model and self.texture:
             self.model.setTexScale(TextureStage.getDefault(), value[0], value[1])
             self.set_shader_input('texture_scale', value)
+        self._invalidate_static()
 
     def texture_offset_getter(self):
         return getattr(self, '_texture_offset', Vec2(0,0))
@@ -791,6 +1069,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
             self.texture = self.texture
             self.set_shader_input('texture_offset', value)
         self._texture_offset = value
+        self._invalidate_static()
 
     def tileset_size_getter(self):         # if the texture is a tileset, say how many tiles there are so it only use one tile of the texture, e.g. tileset_size=[8,4]
         return self._tileset_size
@@ -819,6 +1098,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
         self.set_bin("fixed", 0)
         self.set_depth_write(not value)
         self.set_depth_test(not value)
+        self._invalidate_static()
 
 
     def unlit_setter(self, value):  # set to True to ignore light and not cast shadows
@@ -828,6 +1108,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
             self.hide(0b0001)
         else:
             self.show(0b0001)
+        self._invalidate_static()
 
 
     def billboard_setter(self, value):  # set to True to make this Entity always face the camera.
@@ -839,6 +1120,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
     def wireframe_setter(self, value):  # set to True to render model as wireframe
         self._wireframe = value
         self.setRenderModeWireframe(value)
+        self._invalidate_static()
 
 
     def generate_sphere_map(self, size=512, name=f'sphere_map_{len(scene.entities)}'):
@@ -910,17 +1192,16 @@ class Entity(NodePath, metaclass=PostInitCaller):
             class_instance.entity = self
             class_instance.enabled = True
             self.scripts.append(class_instance)
+            self._update_handler_registration()
             if hasattr(class_instance, 'on_script_added') and callable(class_instance.on_script_added):
                 class_instance.on_script_added()
             # print('added script:', camel_to_snake(name.__class__.__name__))
             return class_instance
 
 
-    def combine(self, analyze=False, auto_destroy=True, ignore=[], ignore_disabled=True, include_normals=False):
+    def combine(self, analyze=False, auto_destroy=True, ignore=[], ignore_disabled=True, include_normals=False, group_by_material=False, max_vertices=None, threaded=False):
         from ursina.scripts.combine import combine
-
-        self.model = combine(self, analyze, auto_destroy, ignore, ignore_disabled, include_normals)
-        return self.model
+        return combine(self, analyze, auto_destroy, ignore, ignore_disabled, include_normals, group_by_material, max_vertices, threaded)
 
 
     def flipped_faces_setter(self, value):
@@ -929,6 +1210,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
             self.setAttrib(CullFaceAttrib.make(CullFaceAttrib.MCullClockwise))
         else:
             self.setAttrib(CullFaceAttrib.make(CullFaceAttrib.MCullCounterClockwise))
+        self._invalidate_static()
 
 
     def look_at(self, target, axis='forward', up=None): # up defaults to self.up
@@ -941,6 +1223,7 @@ class Entity(NodePath, metaclass=PostInitCaller):
         if up:
             up_axis = up
         self.lookAt(target, up_axis)
+        self._invalidate_static()
 
         if axis == 'forward':
             return
@@ -990,26 +1273,14 @@ class Entity(NodePath, metaclass=PostInitCaller):
 
         return False
 
-    def has_disabled_ancestor(self):
-        p = self
-        for i in range(100):
-            if not p.parent:
-                return False
-            if not hasattr(p, 'parent') or not hasattr(p.parent, 'enabled'):
-                return False
-
-            p = p.parent
-
-            if p.enabled is False:
-                return True
-
-        return False
+    def has_disabled_ancestor(self):   # uses the parent's cached enabled_in_hierarchy instead of walking up the hierarchy
+        return not getattr(getattr(self, '_parent', None), '_enabled_in_hierarchy', True)
 
     def children_getter(self):
         return [e for e in getattr(self, '_children', []) if e]     # make sure list doesn't contain destroyed entities
 
     def children_setter(self, value):
-        self._children = value
+        self._children = OrderedSet(value)
 
     def loose_children_getter(self):
         return getattr(self, '_loose_children', [])
@@ -1079,6 +1350,10 @@ class Entity(NodePath, metaclass=PostInitCaller):
 #------------
 # ANIMATIONS
 #------------
+    def start_coroutine(self, coroutine):   # start a generator or async def that can yield/await wait(seconds), next_frame() and until(condition). gets killed when the entity is destroyed.
+        return coroutines.scheduler.start(coroutine, entity=self)
+
+
     def animate(self, name, value, duration=.1, delay=0, curve=curve.in_expo, loop=False, resolution=None, interrupt='kill', time_step=None, unscaled=False, auto_play=True, auto_destroy=True):
         if duration == 0 and delay == 0:
             setattr(self, name, value)
@@ -1095,6 +1370,17 @@ class Entity(NodePath, metaclass=PostInitCaller):
         if hasattr(self, animator_name) and getattr(self, animator_name) in self.animations:
             self.animations.remove(getattr(self, animator_name))
 
+        start_value = getattr(self, name)
+        if numpy_available and Tween.can_tween(start_value, value):
+            # numbers, vectors and colors are updated together with all other tweens in one vectorized pass every frame
+            tween = Tween(self, name, start_value, value, duration=duration, delay=delay, curve=curve, loop=loop, resolution=resolution,
+                time_step=time_step, unscaled=unscaled, ignore_paused=self.ignore_paused)
+            setattr(self, animator_name, tween)
+            self.animations.append(tween)
+            if auto_play:
+                tween.start()
+            return tween
+
         sequence = Sequence(loop=loop, time_step=time_step, auto_destroy=auto_destroy, unscaled=unscaled, ignore_paused=self.ignore_paused, name=name)
         sequence.append(Wait(delay))
         
@@ -1104,12 +1390,14 @@ class Entity(NodePath, metaclass=PostInitCaller):
         if not resolution:
             resolution = max(int(duration * 60), 1)
 
+        steps = []  # add them all at once with extend(), since append() regenerates the sequence every time
         for i in range(resolution+1):
             t = i / resolution
             t = curve(t)
 
-            sequence.append(Wait(duration / resolution))
-            sequence.append(Func(setattr, self, name, lerp(getattr(self, name), value, t)))
+            steps.append(Wait(duration / resolution))
+            steps.append(Func(setattr, self, name, lerp(getattr(self, name), value, t)))
+        sequence.extend(steps)
 
         if auto_play:
             sequence.start()
@@ -1154,15 +1442,17 @@ class Entity(NodePath, metaclass=PostInitCaller):
         self.shake_sequence = Sequence(Wait(delay))
         original_position = getattr(self, attr_name)
 
+        steps = []
         for i in range(int(duration / speed)):
-            self.shake_sequence.append(Func(setattr, self, attr_name,
+            steps.append(Func(setattr, self, attr_name,
                 Vec3(
                     original_position[0] + (random.uniform(-.1, .1) * magnitude * direction[0]),
                     original_position[1] + (random.uniform(-.1, .1) * magnitude * direction[1]),
                     original_position[2],
                 )))
-            self.shake_sequence.append(Wait(speed))
-            self.shake_sequence.append(Func(setattr, self, attr_name, original_position))
+            steps.append(Wait(speed))
+            steps.append(Func(setattr, self, attr_name, original_position))
+        self.shake_sequence.extend(steps)
 
         self.animations.append(self.shake_sequence)
         self.shake_sequence.unscaled = unscaled
@@ -13,11 +13,19 @@ from ursina.camera import instance as camera
 from ursina.mouse import instance as mouse
 from ursina import entity
 from ursina import shader
+from ursina.scripts import update_lod
+from ursina.scripts import async_loader
+from ursina.scripts import coroutines
+from ursina.scripts.tween_engine import tween_engine
+from ursina.scripts import timers, static_flattening
+from ursina.scripts.profiler import profiler
+from ursina.ursinastuff import flush_destroy_queue
 
 
 import __main__
 time.dt = 0
 time.dt_unscaled = 0
+time.fixed_alpha = 0    # how far we are between the previous and the next fixed update (0-1). use it to interpolate between fixed update states when rendering.
 keyboard_keys = '1234567890qwertyuiopasdfghjklzxcvbnm'
 
 
@@ -111,6 +119,7 @@ class Ursina(ShowBase):
         self.mouse = mouse
 
         scene.set_up()
+        self._fixed_time_accumulator = 0
         self._update_task = self.taskMgr.add(self._update, "update")
 
         # try to load settings that need to be applied before entity creation
@@ -164,37 +173,103 @@ class Ursina(ShowBase):
         if application.calculate_dt:
             time.dt_unscaled = globalClock.getDt()
             time.dt = time.dt_unscaled * application.time_scale          # time between frames
+
+        profiling = profiler.enabled
+        if profiling:
+            profiler.begin_frame()
+
         mouse.update()
+        async_loader.update()   # swap in models and textures that finished loading in the background
 
         if hasattr(__main__, 'update') and __main__.update and not application.paused:
+            if profiling: t = time.perf_counter()
             __main__.update()
+            if profiling: profiler.record('update', '__main__', t)
 
-        for seq in application.sequences:
+        sequences = application.sequences
+        for seq in sequences:
+            if seq not in sequences:    # killed earlier this frame
+                continue
+            if profiling: t = time.perf_counter()
             seq.update()
+            if profiling: profiler.record('sequence', seq.name, t)
+
+        tween_engine.update()           # all animate() tweens, in one vectorized pass
+        timers.scheduler.update()       # invoke(), @after and @every
+        coroutines.scheduler.update()   # resume coroutines that are done waiting
+
+        if application.fixed_timestep:
+            self._fixed_time_accumulator += time.dt
+            dt = time.dt
+            time.dt = application.fixed_timestep
+            steps = 0
+            while self._fixed_time_accumulator >= application.fixed_timestep:
+                if steps >= application.max_fixed_steps:    # can't keep up, drop the remaining time instead of falling further behind each frame
+                    self._fixed_time_accumulator %= application.fixed_timestep
+                    break
+                self._fixed_update()
+                self._fixed_time_accumulator -= application.fixed_timestep
+                steps += 1
+
+            time.dt = dt
+            time.fixed_alpha = self._fixed_time_accumulator / application.fixed_timestep
 
-        for e in scene.entities:
-            if not e.enabled or e.ignore:
+        updaters = scene.handlers['update']
+        for e in updaters:
+            if e not in updaters or e.ignore:  # got destroyed or disabled earlier this frame, by itself or an ancestor
                 continue
             if application.paused and e.ignore_paused is False:
                 continue
-            if e.has_disabled_ancestor():
-                continue
 
             if hasattr(e, 'update') and callable(e.update):
+                if profiling: t = time.perf_counter()
                 e.update()
+                if profiling: profiler.record('update', e.__class__.__name__, t)
 
             if hasattr(e, 'scripts'):
                 for script in e.scripts:
                     if script.enabled and hasattr(script, 'update') and callable(script.update):
+                        if profiling: t = time.perf_counter()
                         script.update()
+                        if profiling: profiler.record('script', script.__class__.__name__, t)
 
             if e.shader:
+                if profiling: t = time.perf_counter()
                 for key, value in e.shader.continuous_input.items():
                     e.set_shader_input(key, value())
+                if profiling and e.shader.continuous_input: profiler.record('shader', e.shader.name, t)
+
+        update_lod.scheduler.update()  # entities with an update_lod, only the ones that are due this frame
+        flush_destroy_queue()   # destroy everything destroy() was called on this frame
+        static_flattening.scheduler.update()   # rebuild static entities that stopped changing
+
+        if profiling:
+            profiler.end_frame()
 
         return Task.cont
 
 
+    def _fixed_update(self):
+        """Internal method that runs every application.fixed_timestep seconds when that is set. Calls fixed_update() on the main script, entities and scripts."""
+        if hasattr(__main__, 'fixed_update') and __main__.fixed_update and not application.paused:
+            __main__.fixed_update()
+
+        fixed_updaters = scene.handlers['fixed_update']
+        for e in fixed_updaters:
+            if e not in fixed_updaters or e.ignore:
+                continue
+            if application.paused and e.ignore_paused is False:
+                continue
+
+            if hasattr(e, 'fixed_update') and callable(e.fixed_update):
+                e.fixed_update()
+
+            if hasattr(e, 'scripts'):
+                for script in e.scripts:
+                    if script.enabled and hasattr(script, 'fixed_update') and callable(script.fixed_update):
+                        script.fixed_update()
+
+
     def input_up(self, key, is_raw=False): # internal method for key release
         if not is_raw and key in keyboard_keys:
             return
@@ -252,26 +327,27 @@ class Ursina(ShowBase):
                     __main__.input(key)
 
         break_outer = False
+        profiling = profiler.enabled
 
-
-        for e in scene.entities:
-            if e.enabled is False or e.ignore or e.ignore_input:
+        input_handlers = scene.handlers['input']
+        for e in input_handlers:
+            if e not in input_handlers or e.ignore or e.ignore_input:    # got destroyed or disabled by an earlier input handler
                 continue
             if application.paused and e.ignore_paused is False:
                 continue
-            if e.has_disabled_ancestor():
-                continue
 
             if break_outer:
                 break
 
             if hasattr(e, 'input') and callable(e.input):
+                if profiling: t = time.perf_counter()
                 for key in bound_keys:
                     if break_outer:
                         break
                     if e.input(key):    # if the input function returns True, eat the input
                         break_outer = True
                         break
+                if profiling: profiler.record('input', e.__class__.__name__, t)
 
             if hasattr(e, 'scripts'):
                 if break_outer:
@@ -282,10 +358,12 @@ class Ursina(ShowBase):
                         break
 
                     if script.enabled and hasattr(script, 'input') and callable(script.input):
+                        if profiling: t = time.perf_counter()
                         for key in bound_keys:
                             if script.input(key): # if the input function returns True, eat the input
                                 break_outer = True
                                 break
+                        if profiling: profiler.record('input', script.__class__.__name__, t)
 
         for key in bound_keys:
             mouse.input(key)
@@ -303,8 +381,9 @@ class Ursina(ShowBase):
             if hasattr(__main__, 'text_input'):
                 __main__.text_input(key)
 
-        for e in scene.entities:
-            if e.enabled is False or e.ignore or e.ignore_input:
+        text_input_handlers = scene.handlers['text_input']
+        for e in text_input_handlers:
+            if e not in text_input_handlers or e.ignore or e.ignore_input:
                 continue
             if application.paused and e.ignore_paused is False:
                 continue
@@ -3,6 +3,7 @@ from enum import Enum
 from textwrap import dedent
 import numbers
 import array
+import importlib.util
 
 from ursina import application
 from ursina import color
@@ -41,6 +42,23 @@ class MeshModes(Enum):
 
 
 
+numpy_available = importlib.util.find_spec('numpy') is not None    # interleaved meshes fall back to one array per attribute without numpy
+
+
+def _is_array(data):    # numpy arrays and anything else that looks like one
+    return hasattr(data, '__array_interface__')
+
+
+def _pack(values, numeric_type):    # convert float values to what panda expects for a column of numeric_type
+    import numpy as np
+    if numeric_type == p3d.Geom.NT_uint8:   # normalized, like colors
+        return np.clip(np.rint(values * 255), 0, 255).astype(np.uint8)
+    if numeric_type == getattr(p3d.Geom, 'NT_float16', None):
+        return values.astype(np.float16)
+    return np.ascontiguousarray(values, dtype=np.float32)
+
+
+
 class Mesh(p3d.NodePath):
     _modes = {
         'triangle' : p3d.GeomTriangles,
@@ -50,7 +68,7 @@ class Mesh(p3d.NodePath):
         'point' : p3d.GeomPoints,
     }
 
-    def __init__(self, vertices=None, triangles=None, colors=None, uvs=None, normals=None, static=True, mode='triangle', thickness=1, render_points_in_3d=True, vertex_buffer=None, vertex_buffer_length=None, vertex_buffer_format=None):
+    def __init__(self, vertices=None, triangles=None, colors=None, uvs=None, normals=None, static=True, mode='triangle', thickness=1, render_points_in_3d=True, vertex_buffer=None, vertex_buffer_length=None, vertex_buffer_format=None, interleaved=False):
         super().__init__('mesh')
         self.vertices = vertices
         self.triangles = triangles
@@ -64,6 +82,7 @@ class Mesh(p3d.NodePath):
         self.vertex_buffer = vertex_buffer
         self.vertex_buffer_length = vertex_buffer_length
         self.vertex_buffer_format = vertex_buffer_format
+        self.interleaved = interleaved  # pack all the attributes into one array, with colors as 8 bit and uvs as 16 bit floats if panda supports them. uses less memory and is uploaded in one go.
 
         self._generated_vertices = None
 
@@ -77,6 +96,8 @@ class Mesh(p3d.NodePath):
 
 
     def _ravel(self, data):
+        if _is_array(data):
+            return data.reshape(-1)
         if not isinstance(data[0], numbers.Real):
             d = []
             for v in data:
@@ -87,6 +108,9 @@ class Mesh(p3d.NodePath):
 
     def _set_array_data(self, array_handle, data, dtype_string='f'):
         a = None
+        if _is_array(data):     # numpy arrays get copied straight into panda's buffer, without going through python objects
+            import numpy as np
+            data = np.ascontiguousarray(data, dtype=np.float32 if dtype_string == 'f' else np.uint32).reshape(-1)
         try:
             a = memoryview(data).cast('B').cast(dtype_string)
         except:
@@ -148,6 +172,16 @@ class Mesh(p3d.NodePath):
                 vertex_array_format.addColumn(attribute_type_name, attribute_count, attribute_dtype, attribute_type)
             vertex_format.addArray(vertex_array_format)
 
+        elif self.interleaved and numpy_available:
+            vertex_array_format = p3d.GeomVertexArrayFormat('vertex', 3, p3d.Geom.NT_float32, p3d.Geom.C_point)
+            if self.colors is not None and len(self.colors) > 0:
+                vertex_array_format.add_column('color', 4, p3d.Geom.NT_uint8, p3d.Geom.C_color)
+            if self.uvs is not None and len(self.uvs) > 0 and self.mode not in ['line', 'point']:
+                vertex_array_format.add_column('texcoord', 2, getattr(p3d.Geom, 'NT_float16', p3d.Geom.NT_float32), p3d.Geom.C_texcoord)
+            if self.normals is not None and len(self.normals) > 0 and self.mode not in ['line', 'point']:
+                vertex_array_format.add_column('normal', 3, p3d.Geom.NT_float32, p3d.Geom.C_normal)
+            vertex_format.add_array(vertex_array_format)
+
         else:
             vertex_format = p3d.GeomVertexFormat()
             vertex_format.add_array(p3d.GeomVertexFormat.getV3().arrays[0])
@@ -175,6 +209,9 @@ class Mesh(p3d.NodePath):
             vmem = memoryview(array_handle).cast('B')
             vmem[:] = m
 
+        elif self.interleaved and numpy_available:
+            self._pack_interleaved(vdata)
+
         else:
             if isinstance(self.vertices[0], numbers.Real):
                 vdata.unclean_set_num_rows(len(self.vertices) // 3)
@@ -209,6 +246,16 @@ class Mesh(p3d.NodePath):
             prim.close_primitive()
             geom.addPrimitive(prim)
 
+        elif _is_array(self.triangles):    # (n,3) or (n,4) arrays get flattened by .indices
+            prim = Mesh._modes[self.mode](static_mode)
+            prim.set_index_type(p3d.GeomEnums.NT_uint32)
+            indices = self.indices
+            parray = prim.modify_vertices()
+            parray.unclean_set_num_rows(len(indices))
+            self._set_array_data(parray, indices, 'I')
+            prim.close_primitive()
+            geom.addPrimitive(prim)
+
         else:
             if not isinstance(self.triangles[0], numbers.Real): # triangles provided as [(0,1,2), (3,4,5,6), ...] etc., so unpack them
                 line_segments = []
@@ -254,12 +301,181 @@ class Mesh(p3d.NodePath):
             self.setTexGen(p3d.TextureStage.getDefault(), p3d.TexGenAttrib.MPointSprite)
 
 
+    def _pack_interleaved(self, vdata):
+        import numpy as np
+        n = len(self.vertices) // 3 if isinstance(self.vertices[0], numbers.Real) else len(self.vertices)
+        array_format = vdata.get_format().get_array(0)
+        data = np.zeros((n, array_format.get_stride()), dtype=np.uint8)
+
+        for name, column_name, num_components in (('vertices', 'vertex', 3), ('colors', 'color', 4), ('uvs', 'texcoord', 2), ('normals', 'normal', 3)):
+            column = array_format.get_column(column_name)
+            if column is None:
+                continue
+            values = np.asarray(getattr(self, name), dtype=np.float32).reshape(-1, num_components)
+            if len(values) != n:
+                raise Exception(f'Error in Mesh. Ensure Mesh is valid and the inputs have same length: vertices:{len(self.vertices)}, normals:{len(self.normals)}, colors:{len(self.colors)}, uvs:{len(self.uvs)}')
+            start = column.get_start()
+            data[:, start : start+column.get_total_bytes()] = _pack(values, column.get_numeric_type()).view(np.uint8).reshape(n, -1)
+
+        vdata.unclean_set_num_rows(n)
+        memoryview(vdata.modify_array(0)).cast('B')[:] = data.reshape(-1)
+
+
+    def update_vertices(self, start=0, values=None):    # write new vertices into the existing vertex buffer, starting at vertex index start. only the changed rows get written, so it's a lot faster than generate() for deforming meshes.
+        self._generated_vertices = None
+        self._update_column('vertices', 'vertex', 3, start, values)
+
+    def update_colors(self, start=0, values=None):  # same as update_vertices(), but for colors
+        self._update_column('colors', 'color', 4, start, values)
+
+    def update_uvs(self, start=0, values=None):
+        self._update_column('uvs', 'texcoord', 2, start, values)
+
+    def update_normals(self, start=0, values=None):
+        self._update_column('normals', 'normal', 3, start, values)
+
+
+    def _update_column(self, name, column_name, num_components, start, values):
+        # if values is None, upload what's in the list from start, for example after changing self.vertices in place.
+        # otherwise write them into the list as well, so the next generate() gives the same result. meshes made from a vertex_buffer only get the vertex data changed.
+        current = getattr(self, name)
+        is_flat = len(current) > 0 and isinstance(current[0], numbers.Real)
+        if values is None:
+            values = current[start*num_components:] if is_flat else current[start:]
+        elif len(values) > 0 and self.vertex_buffer is None:
+            if isinstance(current, tuple):
+                current = list(current)
+                setattr(self, name, current)
+            if is_flat:
+                flat_values = self._ravel(values)
+                current[start*num_components : start*num_components+len(flat_values)] = flat_values
+            else:
+                rows = values if not isinstance(values[0], numbers.Real) else [tuple(values[i:i+num_components]) for i in range(0, len(values), num_components)]
+                current[start:start+len(rows)] = rows
+
+        if len(values) == 0:
+            return
+        if _is_array(values):
+            import numpy as np
+            data = np.ascontiguousarray(values, dtype=np.float32).reshape(-1)
+        else:
+            data = array.array('f', self._ravel(values))
+        num_rows = len(data) // num_components
+
+        geom_node = getattr(self, 'geomNode', None)
+        if geom_node is None or geom_node.get_num_geoms() != 1:
+            return self.generate()
+
+        vertex_data = geom_node.modify_geom(0).modify_vertex_data()
+        vertex_format = vertex_data.get_format()
+        array_index = vertex_format.get_array_with(column_name)
+        if array_index < 0 or start + num_rows > vertex_data.get_num_rows():   # the layout changed, so build it from scratch
+            return self.generate()
+
+        array_format = vertex_format.get_array(array_index)
+        column = array_format.get_column(column_name)
+        if column.get_num_components() != num_components:
+            return self.generate()
+
+        if numpy_available and (array_format.get_num_columns() > 1 or column.get_numeric_type() != p3d.Geom.NT_float32):   # interleaved or compact, so let numpy do the striding and converting
+            import numpy as np
+            rows = self._column_rows(vertex_data, array_index, column)
+            if rows is None:
+                return self.generate()
+            rows[start:start+num_rows] = _pack(np.asarray(data, dtype=np.float32).reshape(-1, num_components), column.get_numeric_type())
+            return
+
+        if column.get_numeric_type() != p3d.Geom.NT_float32:
+            return self.generate()
+
+        stride = array_format.get_stride() // 4
+        offset = column.get_start() // 4
+        view = memoryview(vertex_data.modify_array(array_index)).cast('B').cast('f')
+        if stride == num_components:    # the column has its own array, so the rows are next to each other
+            view[start*stride : (start+num_rows)*stride] = data
+        else:
+            for i in range(num_rows):
+                row_start = (start+i) * stride + offset
+                view[row_start : row_start+num_components] = data[i*num_components : (i+1)*num_components]
+
+
+    # numpy views of the generated vertex data. writing into them changes the mesh right away without copying anything,
+    # but the changes don't end up in .vertices etc., so they get lost on the next generate(). get the view again after generate().
+    # assigning a whole array, like mesh.vertices_array = new_vertices, goes through update_vertices() etc. and keeps .vertices in sync.
+    @property
+    def vertices_array(self):
+        return self._column_view('vertex', 3)
+
+    @vertices_array.setter
+    def vertices_array(self, value):
+        self.update_vertices(0, value)
+
+    @property
+    def colors_array(self):
+        return self._column_view('color', 4)
+
+    @colors_array.setter
+    def colors_array(self, value):
+        self.update_colors(0, value)
+
+    @property
+    def uvs_array(self):
+        return self._column_view('texcoord', 2)
+
+    @uvs_array.setter
+    def uvs_array(self, value):
+        self.update_uvs(0, value)
+
+    @property
+    def normals_array(self):
+        return self._column_view('normal', 3)
+
+    @normals_array.setter
+    def normals_array(self, value):
+        self.update_normals(0, value)
+
+
+    def _column_view(self, column_name, num_components):   # shape (rows, num_components) float32 array sharing memory with panda's vertex data. None if the mesh doesn't have the column, or doesn't store it as floats, like the colors of interleaved meshes.
+        geom_node = getattr(self, 'geomNode', None)
+        if geom_node is None or geom_node.get_num_geoms() == 0:
+            return None
+
+        vertex_data = geom_node.modify_geom(0).modify_vertex_data()     # modify_*() marks it as changed, so panda uploads it again
+        array_index = vertex_data.get_format().get_array_with(column_name)
+        if array_index < 0:
+            return None
+        column = vertex_data.get_format().get_array(array_index).get_column(column_name)
+        if column.get_numeric_type() != p3d.Geom.NT_float32:
+            return None
+        return self._column_rows(vertex_data, array_index, column)[:, :num_components]
+
+
+    def _column_rows(self, vertex_data, array_index, column):   # numpy view of one column of an array in vertex_data, shape (rows, components). None for types numpy doesn't have.
+        import numpy as np
+        dtype = {p3d.Geom.NT_float32: np.float32, p3d.Geom.NT_uint8: np.uint8, getattr(p3d.Geom, 'NT_float16', -1): np.float16}.get(column.get_numeric_type())
+        if dtype is None:
+            return None
+        itemsize = np.dtype(dtype).itemsize
+        stride = vertex_data.get_format().get_array(array_index).get_stride()
+        if stride % itemsize or column.get_start() % itemsize:
+            return None
+
+        rows = np.frombuffer(memoryview(vertex_data.modify_array(array_index)).cast('B'), dtype=dtype).reshape(-1, stride // itemsize)
+        offset = column.get_start() // itemsize
+        return rows[:, offset : offset+column.get_num_components()]
+
+
     @property
     def indices(self):
-        if not self.triangles:
+        if len(self.triangles) == 0:
             return list(range(len(self.vertices)))
 
-        if self.triangles and isinstance(self.triangles[0], numbers.Real):
+        if _is_array(self.triangles):
+            if self.triangles.ndim == 2 and self.triangles.shape[1] == 4:   # quads
+                return self.triangles[:, (0,1,2, 2,3,0)].reshape(-1)
+            return self.triangles.reshape(-1)
+
+        if isinstance(self.triangles[0], numbers.Real):
             return self.triangles
 
         indices = []
@@ -282,7 +498,9 @@ class Mesh(p3d.NodePath):
     @property
     def generated_vertices(self):
         if self._generated_vertices is None:
-            if self.triangles is not None and len(self.triangles) > 0:
+            if _is_array(self.vertices) and not isinstance(self.vertices[0], numbers.Real):
+                self._generated_vertices = self.vertices[self.indices] if len(self.triangles) > 0 else self.vertices
+            elif self.triangles is not None and len(self.triangles) > 0:
                 if not isinstance(self.triangles[0], numbers.Real):
                     tris = []
                     for tup in self.triangles:
@@ -312,12 +530,13 @@ class Mesh(p3d.NodePath):
         if vbuf_format is not None:
             vbuf_format = f'"{vbuf_format}"'
 
+        vertices, triangles, colors, uvs, normals = [e.tolist() if _is_array(e) else e for e in (self.vertices, self.triangles, self.colors, self.uvs, self.normals)]
         mesh_as_string = 'Mesh('
-        mesh_as_string += f'\n    vertices={[tuple(round(e, vertex_decimal_limit) for e in vert) for vert in self.vertices]},' if self.vertices else ''
-        mesh_as_string += f'\n    triangles={self.triangles},' if self.triangles else ''
-        mesh_as_string += f'\n    colors={[tuple(round(e, color_decimal_limit) for e in col) for col in self.colors]},' if self.colors else ''
-        mesh_as_string += f'\n    uvs={[tuple(round(e, uv_decimal_limit) for e in uv) for uv in self.uvs]},' if self.uvs else ''
-        mesh_as_string += f'\n    normals={[tuple(round(e, normal_decimal_limit) for e in norm) for norm in self.normals]},' if self.normals else ''
+        mesh_as_string += f'\n    vertices={[tuple(round(e, vertex_decimal_limit) for e in vert) for vert in vertices]},' if vertices else ''
+        mesh_as_string += f'\n    triangles={triangles},' if triangles else ''
+        mesh_as_string += f'\n    colors={[tuple(round(e, color_decimal_limit) for e in col) for col in colors]},' if colors else ''
+        mesh_as_string += f'\n    uvs={[tuple(round(e, uv_decimal_limit) for e in uv) for uv in uvs]},' if uvs else ''
+        mesh_as_string += f'\n    normals={[tuple(round(e, normal_decimal_limit) for e in norm) for norm in normals]},' if normals else ''
         mesh_as_string += f'\n    static={self.static},' if not self.static else ''
         mesh_as_string += f'\n    mode="{self.mode}",' if self.mode != 'triangle' else ''
         mesh_as_string += f'\n    thickness={self.thickness},' if self.thickness != 1 else ''
@@ -325,6 +544,7 @@ class Mesh(p3d.NodePath):
         mesh_as_string += f'\n    vertex_buffer={self.vertex_buffer},' if self.vertex_buffer is not None else ''
         mesh_as_string += f'\n    vertex_buffer_length={self.vertex_buffer_length},' if self.vertex_buffer_length is not None else ''
         mesh_as_string += f'\n    vertex_buffer_format={vbuf_format},' if self.vertex_buffer_format is not None else ''
+        mesh_as_string += f'\n    interleaved={self.interleaved},' if self.interleaved else ''
 
         mesh_as_string += '\n    )'
         return mesh_as_string
@@ -353,29 +573,38 @@ class Mesh(p3d.NodePath):
         if self.vertex_buffer is not None:
             raise Exception("Can't add mesh with vertex buffer to another mesh (operation not supported).")
 
-        self.vertices += other.vertices
-        self.triangles += other.triangles
-        if other.colors:
-            self.colors += other.colors
+        for name in ('vertices', 'triangles', 'colors', 'normals', 'uvs'):    # += on numpy arrays would add the values together instead of joining them
+            if _is_array(getattr(self, name)):
+                setattr(self, name, getattr(self, name).tolist())
+        vertices, triangles, colors, uvs, normals = [e.tolist() if _is_array(e) else e for e in (other.vertices, other.triangles, other.colors, other.uvs, other.normals)]
+
+        self.vertices += vertices
+        self.triangles += triangles
+        if len(colors):
+            self.colors += colors
         else:
-            self.colors += (color.white, ) * len(other.vertices)
-        self.normals += other.normals
-        self.uvs += other.uvs
+            self.colors += (color.white, ) * len(vertices)
+        self.normals += normals
+        self.uvs += uvs
 
     def __deepcopy__(self, memo):
+        def copy_of(data, cls):
+            return data.copy() if _is_array(data) else [cls(*e) for e in data]
+
         m = Mesh(
-            vertices=[Vec3(*e) for e in self.vertices],
-            triangles=self.triangles,
-            colors=[Color(*e) for e in self.colors],
-            uvs=[Vec2(*e) for e in self.uvs],
-            normals=[Vec3(*e) for e in self.normals],
+            vertices=copy_of(self.vertices, Vec3),
+            triangles=self.triangles.copy() if _is_array(self.triangles) else self.triangles,
+            colors=copy_of(self.colors, Color),
+            uvs=copy_of(self.uvs, Vec2),
+            normals=copy_of(self.normals, Vec3),
             static=self.static,
             mode=self.mode,
             thickness=self.thickness,
             render_points_in_3d=self.render_points_in_3d,
             vertex_buffer=self.vertex_buffer,
             vertex_buffer_length=self.vertex_buffer_length,
-            vertex_buffer_format=self.vertex_buffer_format
+            vertex_buffer_format=self.vertex_buffer_format,
+            interleaved=self.interleaved,
         )
         m.name = self.name
         return m
@@ -389,7 +618,10 @@ class Mesh(p3d.NodePath):
         self.setRenderModeThickness(value)
 
     def generate_normals(self, smooth=True, regenerate=True):
-        self.normals = list(generate_normals(self.vertices, self.triangles, smooth))
+        if _is_array(self.vertices):
+            self.normals = generate_normals(self.vertices, self.indices if _is_array(self.triangles) else self.triangles, smooth)
+        else:
+            self.normals = list(generate_normals(self.vertices, self.triangles, smooth))
         if regenerate:
             self.generate()
         return self.normals
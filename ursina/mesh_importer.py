@@ -12,10 +12,12 @@ import panda3d.core as p3d
 import gltf
 import builtins
 from ursina.sequence import Func
+import threading
 
 
 imported_meshes = dict()
 blender_scenes = dict()
+_imported_meshes_lock = threading.RLock()  # load_model_async() uses the cache from a background thread
 
 def load_model(name, folder=Func(getattr, application, 'asset_folder'), file_types=('.bam', '.ursinamesh', '.obj', '.glb', '.gltf', '.blend'), use_deepcopy=False, gltf_no_srgb=Func(getattr, application, 'gltf_no_srgb')):
     if callable(folder):
@@ -31,19 +33,20 @@ def load_model(name, folder=Func(getattr, application, 'asset_folder'), file_typ
         name = full_name.split('.')[0]
         file_types = ('.' + full_name.split('.',1)[1],)
 
-    if name in imported_meshes:
-        # print('load cached model', name)
-        try:
-            if not use_deepcopy:
-                instance = copy(imported_meshes[name])
-            else:
-                instance = deepcopy(imported_meshes[name])
+    with _imported_meshes_lock:
+        if name in imported_meshes:
+            # print('load cached model', name)
+            try:
+                if not use_deepcopy:
+                    instance = copy(imported_meshes[name])
+                else:
+                    instance = deepcopy(imported_meshes[name])
 
-            instance.clearTexture()
-            return instance
+                instance.clearTexture()
+                return instance
 
-        except:
-            pass
+            except:
+                pass
 
     for filetype in file_types:
         if use_deepcopy and filetype == '.bam':
@@ -58,7 +61,8 @@ def load_model(name, folder=Func(getattr, application, 'asset_folder'), file_typ
                 gltf_settings = gltf.GltfSettings()
                 gltf_settings.no_srgb = gltf_no_srgb
                 model_root = gltf.load_model(str(file_path), gltf_settings=gltf_settings)
-                imported_meshes[name] = p3d.NodePath(model_root)
+                with _imported_meshes_lock:
+                    imported_meshes[name] = p3d.NodePath(model_root)
                 return p3d.NodePath(model_root)
 
             if filetype == '.ursinamesh':
@@ -68,7 +72,8 @@ def load_model(name, folder=Func(getattr, application, 'asset_folder'), file_typ
                         m.path = file_path
                         m.name = name
                         m.vertices = [Vec3(*v) for v in m.vertices]
-                        imported_meshes[name] = m
+                        with _imported_meshes_lock:
+                            imported_meshes[name] = m
                         return m
                 except:
                     raise Exception('invalid ursinamesh file:', file_path)
@@ -79,7 +84,8 @@ def load_model(name, folder=Func(getattr, application, 'asset_folder'), file_typ
                 m = obj_to_ursinamesh(folder=folder, name=name, return_mesh=True)
                 m.path = file_path
                 m.name = name
-                imported_meshes[name] = m
+                with _imported_meshes_lock:
+                    imported_meshes[name] = m
                 if not use_deepcopy:
                     m.save(f'{name}.bam')
 
@@ -99,6 +105,13 @@ def load_model(name, folder=Func(getattr, application, 'asset_folder'), file_typ
     return None
 
 
+def load_model_async(name, callback, folder=Func(getattr, application, 'asset_folder'), **kwargs):
+    '''Like load_model(), but searches and loads on a background thread, then calls callback(model) on the main thread. model is None if it wasn't found.
+    Returns a concurrent.futures.Future.'''
+    from ursina.scripts import async_loader
+    return async_loader.submit(load_model, name, folder, callback=callback, **kwargs)
+
+
 # find blender installations
 if application.development_mode:
 
@@ -112,6 +112,13 @@ class Pipe(Mesh):
                 if self.color_gradient:
                     self.colors.extend([self.color_gradient[-1], ]*3)
 
+        if not self.static and len(verts) == len(self.vertices) and getattr(self, 'geomNode', None) and self.geomNode.get_num_geoms():
+            # same number of vertices as last time, so only write the new positions and colors instead of building the mesh again
+            self.update_vertices(0, verts)
+            if self.colors:
+                self.update_colors(0, self.colors)
+            return
+
         self.vertices = verts
         super().generate()
         # destroy(b)
@@ -1,4 +1,8 @@
 from ursina import *
+import importlib.util
+
+
+numpy_available = importlib.util.find_spec('numpy') is not None
 
 
 def texture_to_height_values(heightmap, skip=1):
@@ -32,7 +36,7 @@ class Terrain(Mesh):
         if heightmap:
             self.height_values = texture_to_height_values(heightmap, skip)
 
-        elif height_values:
+        elif height_values is not None:
             self.height_values = height_values
 
 
@@ -45,6 +49,9 @@ class Terrain(Mesh):
 
 
     def generate(self):
+        if numpy_available:
+            return self._generate_arrays()
+
         # copy this from Plane to avoid unnecessary init
         self.vertices = []
         self.triangles = []
@@ -79,10 +86,8 @@ class Terrain(Mesh):
 
         if self.gradient:
             self.colors = []
-            for z, column in enumerate(self.height_values):
-                for x, row in enumerate(column):
-                    self.vertices.append(Vec3(x/w, self.height_values[x][z], z/h) + Vec3(centering_offset.x, 0, centering_offset.y))
-                    # terrain.model.colors.append(hsv(0, 0, 1-(terrain.model.height_values[x][z]*1)))
+            for z in range(h):
+                for x in range(w):
                     y = int(self.height_values[x][z]*16)
                     y = clamp(y, 0, 255)
                     self.colors.append(self.gradient[y])
@@ -91,6 +96,36 @@ class Terrain(Mesh):
         super().generate()
 
 
+    def _generate_arrays(self):     # same as above, but builds numpy arrays that Mesh can copy straight into the vertex buffer
+        import numpy as np
+        w, h = self.width, self.depth
+        heights = np.asarray(self.height_values, dtype=np.float32).T    # [z][x], the same order as the vertices
+        _heights = heights / 255
+
+        x, z = np.meshgrid(np.arange(w, dtype=np.float32), np.arange(h, dtype=np.float32))
+        self.vertices = np.stack((x/(w-1) - .5, _heights, z/(h-1) - .5), axis=-1).reshape(-1, 3)
+        self.uvs = np.stack((x/w, z/h), axis=-1).reshape(-1, 2)
+
+        i = (np.arange(1, h)[:, None] * w + np.arange(1, w)).reshape(-1).astype(np.uint32)
+        self.triangles = np.stack((i, i-1, i-w-1, i-w), axis=-1)  # quads
+
+        normals = np.zeros((h, w, 3), dtype=np.float32)
+        normals[..., 1] = 1
+        if w > 2 and h > 2:
+            inner = normals[1:-1, 1:-1]
+            inner[..., 0] = _heights[1:-1, 2:] - _heights[1:-1, :-2]    # right - left
+            inner[..., 2] = _heights[2:, 1:-1] - _heights[:-2, 1:-1]    # forward - back
+            inner /= np.linalg.norm(inner, axis=-1, keepdims=True)
+        self.normals = normals.reshape(-1, 3)
+
+        if self.gradient:
+            gradient = np.array([tuple(c) for c in self.gradient], dtype=np.float32)
+            self.colors = gradient[np.clip((heights*16).astype(np.int32), 0, 255).reshape(-1)]
+        else:
+            self.colors = []
+
+        super().generate()
+
 
 if __name__ == '__main__':
     app = Ursina()
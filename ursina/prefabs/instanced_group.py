@@ -0,0 +1,326 @@
+import panda3d.core as p3d
+from ursina.entity import Entity
+from ursina.shader import Shader
+
+
+instanced_group_shader = Shader(name='instanced_group_shader', language=Shader.GLSL, vertex='''#version 140
+
+uniform mat4 p3d_ModelViewProjectionMatrix;
+uniform samplerBuffer instance_data;
+in vec4 p3d_Vertex;
+in vec2 p3d_MultiTexCoord0;
+in vec4 p3d_Color;
+out vec2 texcoords;
+out vec4 vertex_color;
+uniform vec2 texture_scale;
+uniform vec2 texture_offset;
+
+void main() {
+    // four texels per instance: the three columns of its transform, then its color
+    int i = gl_InstanceID * 4;
+    vec4 v = vec4(p3d_Vertex.xyz, 1.);
+    vec3 p = vec3(dot(texelFetch(instance_data, i), v), dot(texelFetch(instance_data, i+1), v), dot(texelFetch(instance_data, i+2), v));
+
+    gl_Position = p3d_ModelViewProjectionMatrix * vec4(p, 1.);
+    texcoords = (p3d_MultiTexCoord0 * texture_scale) + texture_offset;
+    vertex_color = p3d_Color * texelFetch(instance_data, i+3);
+}
+''',
+
+fragment='''#version 140
+
+uniform sampler2D p3d_Texture0;
+uniform vec4 p3d_ColorScale;
+in vec2 texcoords;
+in vec4 vertex_color;
+out vec4 fragColor;
+
+void main() {
+    fragColor = texture(p3d_Texture0, texcoords) * p3d_ColorScale * vertex_color;
+}
+''',
+default_input={
+    'texture_scale': p3d.Vec2(1, 1),
+    'texture_offset': p3d.Vec2(0, 0),
+}
+)
+
+
+
+class InstancedGroup(Entity):
+    '''Draws lots of copies of one model in a single draw call. The instances aren't entities, just rows in numpy arrays,
+    so there's no per instance cost in Python except when they change. Their transforms and colors are stored in a buffer texture,
+    so there's no limit on the count like with the 256 uniforms of instancing_shader. Requires numpy.
+
+        trees = InstancedGroup(model='cube', texture='brick')
+        ids = trees.add(positions, rotations=rotations, scales=scales, colors=colors)   # shape (n, 3), (n, 3), (n, 3) or (n,), (n, 4)
+        trees.set(ids[:10], positions=new_positions)
+        trees.remove(ids[-10:])
+
+    positions, rotations and scales are relative to the InstancedGroup, like Entity.position/rotation/scale. colors are rgba.
+    add() returns an id for each instance, which stays the same when other instances get removed. You can also change
+    the positions, rotations, scales and colors arrays in place and call mark_dirty(). Only changed instances get recalculated,
+    once per frame in update().
+    '''
+    def __init__(self, model='cube', capacity=1024, **kwargs):
+        import numpy as np
+        self.count = 0
+        self._capacity = 0
+        self._positions = np.zeros((0, 3), dtype=np.float32)
+        self._rotations = np.zeros((0, 3), dtype=np.float32)
+        self._scales = np.ones((0, 3), dtype=np.float32)
+        self._colors = np.ones((0, 4), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)         # the id of each row
+        self._rows = np.zeros(0, dtype=np.int64)        # the row of each id, or -1 if it's removed
+        self._free_ids = np.zeros(0, dtype=np.int64)
+        self._dirty = np.zeros(0, dtype=bool)
+        self._any_dirty = False
+        self._bounds_dirty = False
+        self._box = None            # (min, max) of the positions, or None to calculate it again
+        self._max_scale = 0
+        self._applied_model = None
+
+        self.instance_data = p3d.Texture('instance_data')
+        super().__init__(model=model, shader=instanced_group_shader, **kwargs)
+        self._grow(capacity)
+
+
+    @property
+    def positions(self):    # (count, 3) view in row order. call mark_dirty() after changing it in place.
+        return self._positions[:self.count]
+
+    @property
+    def rotations(self):
+        return self._rotations[:self.count]
+
+    @property
+    def scales(self):
+        return self._scales[:self.count]
+
+    @property
+    def colors(self):
+        return self._colors[:self.count]
+
+    @property
+    def ids(self):  # the id of the instance in each row
+        return self._ids[:self.count]
+
+
+    def _grow(self, capacity):
+        import numpy as np
+        n = self.count
+        for name, fill in (('_positions', 0), ('_rotations', 0), ('_scales', 1), ('_colors', 1), ('_ids', 0), ('_dirty', False)):
+            old = getattr(self, name)
+            new = np.full((capacity, *old.shape[1:]), fill, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+        self._capacity = capacity
+
+        self.instance_data.setup_buffer_texture(capacity * 4, p3d.Texture.T_float, p3d.Texture.F_rgba32, p3d.GeomEnums.UH_dynamic)
+        self.set_shader_input('instance_data', self.instance_data)
+        self.mark_dirty()   # the texture is new, so everything has to be written again
+
+
+    def _new_ids(self, k):  # reuses the ids of removed instances first
+        import numpy as np
+        reused = self._free_ids[len(self._free_ids)-k:] if k else self._free_ids[:0]
+        self._free_ids = self._free_ids[:len(self._free_ids)-len(reused)]
+        start = len(self._rows)
+        self._rows = np.concatenate((self._rows, np.full(k - len(reused), -1, dtype=np.int64)))
+        return np.concatenate((reused, np.arange(start, len(self._rows), dtype=np.int64)))
+
+
+    def add(self, positions, rotations=None, scales=None, colors=None):    # returns the ids of the new instances
+        import numpy as np
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        k = len(positions)
+        if self.count + k > self._capacity:
+            capacity = max(self._capacity, 1)
+            while capacity < self.count + k:
+                capacity *= 2
+            self._grow(capacity)
+
+        ids = self._new_ids(k)
+        rows = np.arange(self.count, self.count + k)
+        self.count += k
+        self._ids[rows] = ids
+        self._rows[ids] = rows
+        self._rotations[rows] = 0
+        self._scales[rows] = 1
+        self._colors[rows] = 1
+        self._write(rows, positions, rotations, scales, colors)
+        return ids
+
+
+    def set(self, ids, positions=None, rotations=None, scales=None, colors=None):     # change some instances. a single value gets used for all of them.
+        self._write(self._rows_of(ids), positions, rotations, scales, colors)
+
+
+    def _rows_of(self, ids):
+        import numpy as np
+        rows = self._rows[np.asarray(ids, dtype=np.int64).reshape(-1)]
+        if (rows < 0).any():
+            raise ValueError('some of the ids have been removed')
+        return rows
+
+
+    def _write(self, rows, positions, rotations, scales, colors):
+        import numpy as np
+        if positions is not None:
+            self._positions[rows] = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        if rotations is not None:
+            self._rotations[rows] = np.asarray(rotations, dtype=np.float32).reshape(-1, 3)
+        if scales is not None:
+            scales = np.asarray(scales, dtype=np.float32)
+            if scales.ndim == 0 or (scales.ndim == 1 and len(scales) == len(rows)):   # one number per instance
+                scales = scales.reshape(-1, 1)
+            self._scales[rows] = scales.reshape(-1, scales.shape[-1] if scales.ndim == 2 else 3)
+        if colors is not None:
+            self._colors[rows] = np.asarray(colors, dtype=np.float32).reshape(-1, 4)
+
+        self._dirty[rows] = True
+        self._any_dirty = True
+        if (positions is not None or scales is not None) and len(self._positions[rows]):
+            if self._box is not None:   # grow the bounds to fit, instead of checking every instance again. None means they get calculated from all of them in _apply_to_model().
+                p = self._positions[rows]
+                self._box = (np.minimum(p.min(axis=0), self._box[0]), np.maximum(p.max(axis=0), self._box[1]))
+                self._max_scale = max(self._max_scale, float(np.abs(self._scales[rows]).max()))
+            self._bounds_dirty = True
+
+
+    def remove(self, ids):
+        import numpy as np
+        ids = np.unique(np.asarray(ids, dtype=np.int64).reshape(-1))
+        ids = ids[self._rows[ids] >= 0]     # already removed
+        if not len(ids):
+            return
+        removed_rows = self._rows[ids]
+        keep = np.ones(self.count, dtype=bool)
+        keep[removed_rows] = False
+        kept_rows = np.flatnonzero(keep)
+
+        # move the rest down, keeping their order. the already calculated texels get moved too, so they don't have to be calculated again.
+        # the bounds stay the same, since they only have to be big enough.
+        n = len(kept_rows)
+        data = np.frombuffer(memoryview(self.instance_data.modify_ram_image()), dtype=np.float32).reshape(-1, 4, 4)
+        for array in (self._positions, self._rotations, self._scales, self._colors, self._ids, self._dirty, data):
+            array[:n] = array[kept_rows]
+        self._rows[ids] = -1
+        self._rows[self._ids[:n]] = np.arange(n)
+        self._free_ids = np.concatenate((self._free_ids, ids))
+        self.count = n
+        self._any_dirty = True  # for the instance count
+
+
+    def remove_all(self):
+        import numpy as np
+        self._rows[:] = -1
+        self._free_ids = np.arange(len(self._rows), dtype=np.int64)
+        self.count = 0
+        self._box = None
+        self._any_dirty = True
+
+
+    def mark_dirty(self, rows=None):    # call after changing the arrays in place. rows: indices, a slice or a bool mask. None for all of them.
+        if rows is None:
+            rows = slice(0, self._capacity)
+        self._dirty[rows] = True
+        self._any_dirty = True
+        self._box = None
+        self._bounds_dirty = True
+
+
+    def update(self):
+        if self._any_dirty:
+            self._upload()
+        elif self.model is not self._applied_model:     # got a new model, which needs the instance count and bounds
+            self._apply_to_model()
+
+
+    def _upload(self):
+        import numpy as np
+        n = self.count
+        rows = np.flatnonzero(self._dirty[:n])
+        self._dirty[:] = False
+        self._any_dirty = False
+
+        if len(rows):
+            # same as Entity's transform: scale, then rotate around z, x and y, then translate. panda multiplies row vectors, v' = v @ m.
+            r = np.radians(self._rotations[rows].astype(np.float64))
+            m = _rotation(2, -r[:, 2]) @ _rotation(0, r[:, 0]) @ _rotation(1, r[:, 1])
+            m *= self._scales[rows, :, None]
+            data = np.frombuffer(memoryview(self.instance_data.modify_ram_image()), dtype=np.float32).reshape(-1, 4, 4)
+            block = np.empty((len(rows), 4, 4), dtype=np.float32)
+            block[:, :3, :3] = m.transpose(0, 2, 1)     # columns of the matrix as texels
+            block[:, :3, 3] = self._positions[rows]
+            block[:, 3] = self._colors[rows]
+            data[rows] = block
+
+        self._apply_to_model()
+
+
+    def _apply_to_model(self):
+        import numpy as np
+        self._applied_model = self.model
+        if not self.model:
+            return
+        if not self.count:
+            self.model.hide()   # an instance count of 0 turns instancing off instead of drawing nothing
+            return
+        self.model.show()
+        self.model.setInstanceCount(self.count)
+
+        if self._bounds_dirty:  # the instances are drawn far away from the model, so panda would cull them based on the model's bounds
+            self._bounds_dirty = False
+            if self._box is None:
+                self._box = (self.positions.min(axis=0), self.positions.max(axis=0))
+                self._max_scale = float(np.abs(self.scales).max())
+            model_lo, model_hi = self.model.get_tight_bounds() or (p3d.Point3(0), p3d.Point3(0))
+            radius = max(p3d.Vec3(model_lo).length(), p3d.Vec3(model_hi).length()) * self._max_scale
+            lo = self._box[0] - radius
+            hi = self._box[1] + radius
+            node = self.model.node()
+            node.set_bounds(p3d.BoundingBox(p3d.Point3(*lo.tolist()), p3d.Point3(*hi.tolist())))
+            node.set_final(True)
+
+
+
+def _rotation(axis, angles):    # rotation matrices around one axis for an array of angles in radians, for row vectors
+    import numpy as np
+    c, s = np.cos(angles), np.sin(angles)
+    i, j = ((1, 2), (2, 0), (0, 1))[axis]
+    m = np.zeros((len(angles), 3, 3))
+    m[:, axis, axis] = 1
+    m[:, i, i] = c
+    m[:, j, j] = c
+    m[:, i, j] = s
+    m[:, j, i] = -s
+    return m
+
+
+
+if __name__ == '__main__':
+    from ursina import *
+    import numpy as np
+    window.vsync = False
+    app = Ursina()
+
+    n = 100_000
+    forest = InstancedGroup(model=Cone(5), texture='brick')
+    ids = forest.add(
+        np.random.uniform(-200, 200, (n, 3)) * (1, 0, 1),
+        rotations=np.random.uniform(0, 360, (n, 3)) * (0, 1, 0),
+        scales=np.random.uniform(.5, 2, n),
+        colors=np.random.uniform(.5, 1, (n, 4)) * (0, 1, 0, 0) + (0, 0, 0, 1),
+        )
+    Entity(model='plane', texture='grass', scale=400, texture_scale=(40, 40))
+
+    def update():   # wobble 1000 of them every frame. only those get recalculated.
+        forest.set(forest.ids[:1000], rotations=np.random.uniform(-5, 5, (min(forest.count, 1000), 3)) * (1, 0, 1))
+
+    def input(key):
+        if key == 'space':
+            forest.remove(forest.ids[np.random.randint(0, forest.count, 1000)])
+
+    EditorCamera()
+    app.run()
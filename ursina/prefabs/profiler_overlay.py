@@ -0,0 +1,42 @@
+from ursina import Text, window, camera
+from ursina.scripts.profiler import profiler
+
+
+class ProfilerOverlay(Text):
+    def __init__(self, n=10, category=None, refresh_rate=30, **kwargs):
+        super().__init__(ignore=False, ignore_paused=True, eternal=True, font='VeraMono.ttf', scale=.75)
+        self.parent = camera.ui
+        self.position = window.top_left
+        self.origin = (-.5, .5)
+        self.z = -999
+        self.n = n                          # how many of the slowest ones to show
+        self.category = category            # only show 'update', 'input', 'script', 'sequence' or 'shader'
+        self.refresh_rate = refresh_rate    # update the text every n frames
+        self.i = 0
+
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
+    def update(self):
+        self.i += 1
+        if self.i < self.refresh_rate:
+            return
+        self.i = 0
+
+        if not profiler.enabled:
+            self.text = 'profiler is off'
+            return
+
+        self.text = profiler.report(self.n, self.category)
+        self.create_background()    # resize to fit the new text
+
+
+if __name__ == '__main__':
+    from ursina import Ursina, Entity
+    app = Ursina()
+    profiler.show_overlay()
+    '''
+    Shows the slowest update/input/script/sequence/shader calls, grouped by class, in the top left corner
+    '''
+    app.run()
@@ -64,7 +64,7 @@ class Slider(Entity):
             self.knob.lock = (0,1,1)
             self.knob.text_entity.y = height/2
 
-        scene.entities.append(self)
+        self.add_to_scene_entities = True
 
 
     @property
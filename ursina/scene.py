@@ -1,14 +1,17 @@
 from panda3d.core import NodePath, Fog
 from ursina import color
+from ursina.scripts.ordered_set import OrderedSet
 
 
 class Scene(NodePath):
 
     def __init__(self):
         super().__init__('scene')
-        self.entities = []
+        self.entities = OrderedSet()   # O(1) removal, so destroying lots of entities doesn't get slower the more there are
         self.collidables = set()
-        self._children = []
+        self._children = OrderedSet()
+        # enabled entities that have an update/fixed_update/input/text_input function or scripts, so the engine doesn't have to check every entity every frame.
+        self.handlers = {name: OrderedSet(sort_key=lambda e: e._scene_order) for name in ('update', 'fixed_update', 'input', 'text_input')}
 
 
     def set_up(self):
@@ -33,10 +36,19 @@ class Scene(NodePath):
                 print('failed to destroy entity', e)
 
 
-        self.entities = to_keep
+        self.entities = OrderedSet(to_keep)
 
 
         application.sequences.clear()
+        from ursina.scripts.tween_engine import tween_engine
+        from ursina.scripts import timers
+        tween_engine.clear()
+        timers.scheduler.clear()
+
+
+    def clear_async(self, budget=4, on_complete=None):    # like clear(), but spread out over several frames, spending at most budget milliseconds per frame. returns a SceneUnloader with .progress and .finished.
+        from ursina.scripts.scene_unloader import SceneUnloader
+        return SceneUnloader(budget=budget, on_complete=on_complete)
 
 
     @property
@@ -66,7 +78,7 @@ class Scene(NodePath):
 
     @children.setter
     def children(self, value):
-        self._children = value
+        self._children = OrderedSet(value)
 
 
 instance = Scene()
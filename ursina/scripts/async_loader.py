@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor, wait as wait_for_futures
+from queue import SimpleQueue
+from ursina.string_utilities import print_warning
+
+
+placeholder_model = 'wireframe_cube'    # shown on entities with async_load=True until their model is loaded. set to None to show nothing.
+placeholder_texture = None              # same, but for textures
+max_workers = 1
+
+executor = None
+_pending = set()            # futures that aren't done yet
+_finished = SimpleQueue()   # (future, callback) for jobs that are done, waiting to be handled on the main thread
+
+
+def submit(function, *args, callback=None, **kwargs):
+    '''Runs function(*args, **kwargs) on a background thread and calls callback(result) on the main thread when it's done.
+    Returns a concurrent.futures.Future.'''
+    global executor
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ursina_loader')
+
+    future = executor.submit(function, *args, **kwargs)
+    _pending.add(future)
+    future.add_done_callback(lambda f: (_finished.put((f, callback)), _pending.discard(f)))
+    return future
+
+
+def update():   # called by the engine every frame
+    while not _finished.empty():
+        future, callback = _finished.get()
+        if future.cancelled():
+            continue
+        exception = future.exception()
+        if exception:
+            print_warning('failed to load asset in the background:', exception)
+            continue
+        if callback:
+            callback(future.result())
+
+
+def wait():  # block until everything submitted so far is loaded and handled, for example at the end of a loading screen
+    while _pending:
+        wait_for_futures(tuple(_pending))
+        update()    # callbacks might submit more
+    update()
+
+
+
+if __name__ == '__main__':
+    from ursina import *
+    app = Ursina()
+
+    for i in range(10):
+        Entity(model='sphere', texture='brick', x=i-5, async_load=True)
+
+    load_model_async('cube', callback=lambda m: print('loaded:', m))
+    app.run()
@@ -1,11 +1,217 @@
 from ursina import *
+import importlib.util
+from concurrent.futures import Future
 
 
-def combine(combine_parent, analyze=False, auto_destroy=True, ignore=[], ignore_disabled=True, include_normals=False):
+numpy_available = importlib.util.find_spec('numpy') is not None     # falls back to combining with python lists without numpy
+
+
+def combine(combine_parent, analyze=False, auto_destroy=True, ignore=[], ignore_disabled=True, include_normals=False, group_by_material=False, max_vertices=None, threaded=False):
+    '''Combines the models of combine_parent and its descendants into one Mesh, which becomes combine_parent's model.
+    group_by_material: make one mesh per texture/shader combination instead of using combine_parent's texture for everything.
+    max_vertices: split the result into more meshes if it would have more vertices than this. entities don't get split up.
+    If that results in more than one mesh, they get added as child entities of combine_parent and a list of those gets returned instead of a Mesh.
+    threaded: do the heavy part on a background thread and return a concurrent.futures.Future with the result.
+    Entities get destroyed and the models get set when it's done, on the main thread.'''
     if not combine_parent.children:
         print_warning('Error, trying to combine children of entity with no children.', combine_parent.children)
         return
 
+    if not numpy_available:
+        if group_by_material or max_vertices or threaded:
+            print_warning('combine(): group_by_material, max_vertices and threaded require numpy')
+        return _combine_lists(combine_parent, analyze, auto_destroy, ignore, ignore_disabled, include_normals)
+
+    import numpy as np
+    # gather everything that needs the scene graph on the main thread. the rest is only numpy, so it can run anywhere.
+    groups = dict()     # material key: {model data key: [arrays, matrices, uv scales, uv offsets, colors]}
+    materials = dict()  # material key: (texture, shader)
+    to_destroy = []
+    model_arrays = dict()
+    for e, mesh, texture, shader in _entities_to_combine(combine_parent, ignore, ignore_disabled):
+        if analyze:
+            print('combining:', e)
+
+        if group_by_material:
+            material_key = (id(getattr(texture, '_texture', texture)), id(shader))  # load_texture() makes a new Texture every time, but they share the panda texture
+            materials[material_key] = (texture, shader)
+        else:
+            material_key = None
+        data_key = (id(mesh.vertices), id(mesh.triangles), id(mesh.uvs), id(mesh.colors), id(mesh.normals))
+        if data_key not in model_arrays:    # entities using the same model share the lists, so they only get converted once
+            model_arrays[data_key] = _model_arrays(mesh)
+
+        batch = groups.setdefault(material_key, dict()).setdefault(data_key, [model_arrays[data_key], [], [], [], []])
+        batch[1].append(np.array(e.model.getTransform(combine_parent).getMat()))
+        batch[2].append(tuple(e.texture_scale))
+        batch[3].append(tuple(e.texture_offset))
+        batch[4].append(tuple(e.color))
+
+        if auto_destroy and e != combine_parent:
+            to_destroy.append(e)
+
+    original_texture = combine_parent.texture
+
+    def finish(results):    # on the main thread
+        if not combine_parent:
+            return None
+
+        for e in to_destroy:
+            destroy(e)
+
+        if len(results) == 1 and not group_by_material:
+            combine_parent.model = Mesh(**results[0][1], mode='triangle')
+            combine_parent.texture = original_texture
+            result = combine_parent.model
+        else:
+            combine_parent.model = None
+            result = []
+            for i, (material_key, arrays) in enumerate(results):
+                texture, shader = materials.get(material_key, (original_texture, None))
+                e = Entity(parent=combine_parent, name=f'combined_{i}', model=Mesh(**arrays, mode='triangle'))
+                if texture:
+                    e.texture = texture
+                if shader:
+                    e.shader = shader
+                result.append(e)
+
+        if analyze:
+            render.analyze()
+        return result
+
+    if not threaded:
+        return finish(_build(groups, include_normals, max_vertices))
+
+    from ursina.scripts import async_loader
+    future = Future()
+    def build():
+        try:
+            return _build(groups, include_normals, max_vertices), None
+        except Exception as e:
+            return None, e
+
+    def on_built(result):
+        results, exception = result
+        try:
+            if exception:
+                raise exception
+            future.set_result(finish(results))
+        except Exception as e:
+            print_warning('combine() failed:', e)
+            future.set_exception(e)
+
+    async_loader.submit(build, callback=on_built)
+    return future
+
+
+def _entities_to_combine(combine_parent, ignore, ignore_disabled):   # walks the subtree instead of scanning every entity. yields (entity, mesh, texture, shader), where texture and shader are inherited from ancestors.
+    loaded_meshes = dict()  # models loaded from .bam files don't have vertices, so load the mesh once per model name instead
+
+    def walk(e, texture, shader):
+        texture = e.texture if e.texture else texture
+        shader = e.shader if e.shader else shader
+        if not (e in ignore or not hasattr(e, 'model') or e.model == None or e.scripts or e.eternal):
+            mesh = e.model
+            if not hasattr(mesh, 'vertices') or not len(mesh.vertices):
+                if e.model.name not in loaded_meshes:
+                    loaded_meshes[e.model.name] = load_model(e.model.name, use_deepcopy=True)
+                mesh = loaded_meshes[e.model.name]
+            if mesh:
+                yield e, mesh, texture, shader
+
+        for c in e.children:
+            if ignore_disabled and not c.enabled:
+                continue
+            yield from walk(c, texture, shader)
+
+    yield from walk(combine_parent, None, None)
+
+
+def _model_arrays(model):   # the model's attributes as numpy arrays, or None if it doesn't have them
+    import numpy as np
+    vertices = np.asarray(model.vertices, dtype=np.float32).reshape(-1, 3)
+    n = len(vertices)
+    indices = np.asarray(model.indices, dtype=np.uint32).reshape(-1)
+    indices = indices[:len(indices) // 3 * 3]
+
+    def attribute(values, num_components):
+        if values is None or len(values) == 0:
+            return None
+        values = np.asarray(values, dtype=np.float32).reshape(-1, num_components)
+        return values if len(values) == n else None
+
+    return vertices, indices, attribute(model.uvs, 2), attribute(model.colors, 4), attribute(model.normals, 3)
+
+
+def _transform(arrays, matrices, uv_scales, uv_offsets, colors, include_normals):   # all the entities using the same model at once
+    import numpy as np
+    vertices, indices, uvs, vertex_colors, normals = arrays
+    n = len(vertices)
+    k = len(matrices)
+
+    matrices = np.asarray(matrices, dtype=np.float64)   # panda matrices are row major and multiply row vectors, so v' = v @ m
+    v = np.einsum('nj,kjl->knl', vertices, matrices[:, :3, :3]) + matrices[:, None, 3, :3]
+    result = dict(
+        vertices = v.reshape(-1, 3).astype(np.float32),
+        triangles = (indices[None, :] + (np.arange(k, dtype=np.uint32) * n)[:, None]).reshape(-1),
+        )
+
+    if uvs is None:
+        uvs = np.zeros((n, 2), dtype=np.float32)
+    result['uvs'] = (uvs[None] * np.asarray(uv_scales, dtype=np.float32)[:, None] + np.asarray(uv_offsets, dtype=np.float32)[:, None]).reshape(-1, 2)
+
+    if vertex_colors is None:
+        vertex_colors = np.ones((n, 4), dtype=np.float32)
+    result['colors'] = (vertex_colors[None] * np.asarray(colors, dtype=np.float32)[:, None]).reshape(-1, 4)
+
+    if include_normals:
+        if normals is None:
+            normals = np.tile(np.array((0, 1, 0), dtype=np.float32), (n, 1))
+        try:
+            normal_matrices = np.linalg.inv(matrices[:, :3, :3]).transpose(0, 2, 1)
+        except np.linalg.LinAlgError:   # scaled to 0 on some axis
+            normal_matrices = matrices[:, :3, :3]
+        rotated = np.einsum('nj,kjl->knl', normals, normal_matrices).reshape(-1, 3)
+        lengths = np.linalg.norm(rotated, axis=1, keepdims=True)
+        result['normals'] = (rotated / np.where(lengths > 0, lengths, 1)).astype(np.float32)
+
+    return result
+
+
+def _join(pieces):
+    import numpy as np
+    offsets = np.cumsum([0] + [len(p['vertices']) for p in pieces[:-1]], dtype=np.uint32)
+    joined = {name: np.concatenate([p[name] for p in pieces]) for name in pieces[0] if name != 'triangles'}
+    joined['triangles'] = np.concatenate([p['triangles'] + offset for p, offset in zip(pieces, offsets)])
+    return joined
+
+
+def _build(groups, include_normals, max_vertices):   # returns [(material key, mesh arrays), ...]. only uses numpy, so it's safe to run on another thread.
+    results = []
+    for material_key, batches in groups.items():
+        pieces = []
+        for arrays, matrices, uv_scales, uv_offsets, colors in batches.values():
+            n = max(len(arrays[0]), 1)
+            step = max(max_vertices // n, 1) if max_vertices else len(matrices)
+            for i in range(0, len(matrices), step):
+                pieces.append(_transform(arrays, matrices[i:i+step], uv_scales[i:i+step], uv_offsets[i:i+step], colors[i:i+step], include_normals))
+
+        chunk = []
+        num_vertices = 0
+        for piece in pieces:
+            if chunk and max_vertices and num_vertices + len(piece['vertices']) > max_vertices:
+                results.append((material_key, _join(chunk)))
+                chunk = []
+                num_vertices = 0
+            chunk.append(piece)
+            num_vertices += len(piece['vertices'])
+        if chunk:
+            results.append((material_key, _join(chunk)))
+
+    return results
+
+
+def _combine_lists(combine_parent, analyze=False, auto_destroy=True, ignore=[], ignore_disabled=True, include_normals=False):
     verts = []
     tris = []
     norms = []
@@ -15,66 +221,51 @@ def combine(combine_parent, analyze=False, auto_destroy=True, ignore=[], ignore_
     o = 0
     original_texture = combine_parent.texture
 
-    for e in scene.entities:
-        if e in ignore:
-            continue
+    for e, mesh, _, _ in _entities_to_combine(combine_parent, ignore, ignore_disabled):
+        if analyze:
+            print('combining:', e)
 
-        if ignore_disabled and not e.enabled:
-            continue
+        vertex_to_world_matrix = e.model.getTransform(combine_parent).getMat()
+        verts += [Vec3(*vertex_to_world_matrix.xformPoint(Vec3(*v))) for v in mesh.vertices]
 
-        if e.has_ancestor(combine_parent) or e == combine_parent:
-            if not hasattr(e, 'model') or e.model == None or e.scripts or e.eternal:
-                continue
-            if not hasattr(e.model, 'vertices') or not e.model.vertices:
-                e.model = load_model(e.model.name, use_deepcopy=True)
-                e.origin = e.origin
-            if not e.model:
-                continue
+        if not mesh.triangles:
+            new_tris = [i for i in range(len(mesh.vertices))]
 
-            if analyze:
-                print('combining:', e)
+        else:
+            new_tris = list()
+            for t in mesh.triangles:
+                if isinstance(t, int):
+                    new_tris.append(t)
+                elif len(t) == 3:
+                    new_tris.extend(t)
+                elif len(t) == 4: # turn quad into tris
+                    new_tris.extend([t[0], t[1], t[2], t[2], t[3], t[0]])
 
-            vertex_to_world_matrix = e.model.getTransform(combine_parent).getMat()
-            verts += [Vec3(*vertex_to_world_matrix.xformPoint(Vec3(*v))) for v in e.model.vertices]
+        new_tris = [t+o for t in new_tris]
+        new_tris = [(new_tris[i], new_tris[i+1], new_tris[i+2]) for i in range(0, len(new_tris)-1, 3)]
 
-            if not e.model.triangles:
-                new_tris = [i for i in range(len(e.model.vertices))]
+        o += len(mesh.vertices)
+        tris += new_tris
 
-            else:
-                new_tris = list()
-                for t in e.model.triangles:
-                    if isinstance(t, int):
-                        new_tris.append(t)
-                    elif len(t) == 3:
-                        new_tris.extend(t)
-                    elif len(t) == 4: # turn quad into tris
-                        new_tris.extend([t[0], t[1], t[2], t[2], t[3], t[0]])
-
-            new_tris = [t+o for t in new_tris]
-            new_tris = [(new_tris[i], new_tris[i+1], new_tris[i+2]) for i in range(0, len(new_tris)-1, 3)]
-
-            o += len(e.model.vertices)
-            tris += new_tris
-
-            if e.model.uvs:
-                uvs.extend([(uv * e.texture_scale) + e.texture_offset for uv in e.model.uvs])
-            else:
-                uvs.extend([(0,0) for e in e.model.vertices])
+        if mesh.uvs:
+            uvs.extend([(uv * e.texture_scale) + e.texture_offset for uv in mesh.uvs])
+        else:
+            uvs.extend([(0,0) for e in mesh.vertices])
 
-            if e.model.colors: # if has vertex colors
-                cols.extend([Color(*vcol) * e.color for vcol in e.model.colors])
+        if mesh.colors: # if has vertex colors
+            cols.extend([Color(*vcol) * e.color for vcol in mesh.colors])
+        else:
+            cols.extend((e.color, ) * len(mesh.vertices))
+
+        if include_normals:
+            if mesh.normals:
+                norms.extend(mesh.normals)
             else:
-                cols.extend((e.color, ) * len(e.model.vertices))
-            
-            if include_normals:
-                if e.model.colors: # if has normals
-                    norms.extend(e.model.normals)
-                else:
-                    norms.extend((Vec3.up, ) * len(e.model.vertices))
+                norms.extend((Vec3.up, ) * len(mesh.vertices))
 
 
-            if auto_destroy and e != combine_parent:
-                to_destroy.append(e)
+        if auto_destroy and e != combine_parent:
+            to_destroy.append(e)
 
     if auto_destroy:
         from ursina import destroy
@@ -82,9 +273,6 @@ def combine(combine_parent, analyze=False, auto_destroy=True, ignore=[], ignore_
 
     combine_parent.model = Mesh(vertices=verts, triangles=tris, normals=norms, uvs=uvs, colors=cols, mode='triangle')
     combine_parent.texture = original_texture
-    # print('combined')
-    # entity.model = Mesh(vertices=verts,  mode='triangle')
-    # entity.flatten_strong()
     if analyze:
         render.analyze()
     return combine_parent.model
@@ -103,6 +291,11 @@ if __name__ == '__main__':
     e2 = Entity(parent=p, model='cube', color=color.yellow, x=1, origin_y=-.5, texture='brick')
     e3 = Entity(parent=e2, model='cube', color=color.yellow, y=2, scale=.5, texture='brick', texture_scale=Vec2(3,3), texture_offset=(.1,.1))
 
+    level = Entity()
+    for x in range(32):
+        for z in range(32):
+            Entity(parent=level, model='cube', position=(x-16, -1, z), texture=random.choice(('grass', 'brick')), color=color.random_color())
+
     def input(key):
         if key == 'space':
             from time import perf_counter
@@ -111,6 +304,10 @@ if __name__ == '__main__':
             p.texture='brick'
             print('combined in:', perf_counter() - t)
 
+        if key == 'enter':  # one mesh per texture, built in the background
+            future = level.combine(group_by_material=True, max_vertices=20_000, threaded=True)
+            future.add_done_callback(lambda f: print('combined level into:', f.result()))
+
     print('----------', p.children)
     # p.combine(include_normals=True)
     # p.y=2
@@ -0,0 +1,216 @@
+import time
+from heapq import heappush, heappop
+from itertools import count
+from ursina import application
+
+
+class wait:
+    '''yield wait(.5) in a generator, or await wait(.5) in an async def, to continue after some seconds.
+    Uses time.dt, so it's affected by application.time_scale and pausing, unless unscaled=True.'''
+    __slots__ = ('duration', 'unscaled')
+
+    def __init__(self, duration, unscaled=False):
+        self.duration = duration
+        self.unscaled = unscaled
+
+    def __await__(self):
+        yield self
+
+
+class next_frame:
+    '''yield next_frame() or await next_frame() to continue on the next frame. A plain yield does the same.'''
+    __slots__ = ()
+
+    def __await__(self):
+        yield self
+
+
+class until:
+    '''yield until(lambda: player.y < 0) or await until(...) to continue once the condition returns True. The condition gets checked once per frame.'''
+    __slots__ = ('condition',)
+
+    def __init__(self, condition):
+        self.condition = condition
+
+    def __await__(self):
+        yield self
+
+
+
+class Coroutine:
+    '''Returned by start_coroutine() and Entity.start_coroutine(). Call kill() to stop it, or pause() and resume().
+    It's in entity.animations, so it also has start(), which resumes it, since a coroutine can't be restarted.'''
+    def __init__(self, coroutine, entity=None):
+        self.coroutine = coroutine
+        self.entity = entity
+        self.finished = False
+        self.paused = False
+        self.result = None      # the return value of the coroutine, once it's finished
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def start(self):
+        self.resume()
+
+    def kill(self):
+        if self.finished:
+            return
+        self.finished = True
+        self.coroutine.close()    # runs finally: blocks inside the coroutine
+
+    def _remove_from_entity(self):
+        if self.entity is not None and hasattr(self.entity, 'animations') and self in self.entity.animations:
+            self.entity.animations.remove(self)
+
+    def __repr__(self):
+        return f'Coroutine({getattr(self.coroutine, "__name__", self.coroutine)}, finished={self.finished})'
+
+
+
+class CoroutineScheduler:
+    '''Resumes coroutines when what they're waiting for is done. Waiting ones are kept in heaps sorted by wake up time,
+    so coroutines that are waiting for a timer cost nothing until they're due.'''
+    def __init__(self):
+        self.time = 0               # scaled time, stops while the application is paused
+        self.unscaled_time = 0
+        self._heap = []             # (wake_time, counter, coroutine)
+        self._unscaled_heap = []
+        self._next_frame = []
+        self._until = []            # (coroutine, condition)
+        self._counter = count()
+
+
+    def start(self, coroutine, entity=None):
+        if callable(coroutine) and not hasattr(coroutine, 'send'):   # got a function instead of a coroutine or generator
+            coroutine = coroutine()
+        if not hasattr(coroutine, 'send'):
+            raise TypeError(f'expected a generator or coroutine, got: {coroutine}')
+
+        c = Coroutine(coroutine, entity)
+        if entity is not None:
+            entity.animations.append(c)     # so it gets killed when the entity gets destroyed
+
+        self._step(c)   # run until the first yield right away
+        return c
+
+
+    def _step(self, c):
+        try:
+            instruction = c.coroutine.send(None)
+        except StopIteration as e:
+            c.finished = True
+            c.result = e.value
+            c._remove_from_entity()
+            return
+        except BaseException:
+            c.finished = True
+            c._remove_from_entity()
+            raise
+
+        if instruction is None or isinstance(instruction, next_frame):
+            self._next_frame.append(c)
+        elif isinstance(instruction, wait):
+            if instruction.unscaled:
+                heappush(self._unscaled_heap, (self.unscaled_time + instruction.duration, next(self._counter), c))
+            else:
+                heappush(self._heap, (self.time + instruction.duration, next(self._counter), c))
+        elif isinstance(instruction, (int, float)):     # yield .5 works too, like Wait in a Sequence
+            heappush(self._heap, (self.time + instruction, next(self._counter), c))
+        elif isinstance(instruction, until):
+            self._until.append((c, instruction.condition))
+        else:
+            c.kill()
+            c._remove_from_entity()
+            raise TypeError(f'coroutines can yield/await wait(), next_frame(), until() or a number, not: {instruction}')
+
+
+    def update(self):   # called by the engine every frame
+        if not application.paused:
+            self.time += time.dt
+        self.unscaled_time += time.dt_unscaled
+
+        due = self._next_frame
+        self._next_frame = []
+        while self._heap and self._heap[0][0] <= self.time:
+            due.append(heappop(self._heap)[2])
+        while self._unscaled_heap and self._unscaled_heap[0][0] <= self.unscaled_time:
+            due.append(heappop(self._unscaled_heap)[2])
+
+        if self._until:
+            waiting = []
+            for c, condition in self._until:
+                if c.finished:
+                    continue
+                if condition():
+                    due.append(c)
+                else:
+                    waiting.append((c, condition))
+            self._until = waiting
+
+        for c in due:
+            if c.finished:  # got killed while waiting
+                continue
+
+            e = c.entity
+            if e is not None and not e:     # entity's node got removed without destroy()
+                c.kill()
+                c._remove_from_entity()
+                continue
+            # like Sequences, pause while the entity (or an ancestor) is disabled or ignored, or the application is paused
+            if c.paused or (application.paused and not (e is not None and e.ignore_paused)) or (e is not None and (not e.enabled_in_hierarchy or e.ignore)):
+                self._next_frame.append(c)
+                continue
+
+            self._step(c)
+
+
+    def clear(self):
+        for c in [e[2] for e in self._heap + self._unscaled_heap] + self._next_frame + [e[0] for e in self._until]:
+            c.kill()
+        self._heap.clear()
+        self._unscaled_heap.clear()
+        self._next_frame.clear()
+        self._until.clear()
+
+
+scheduler = CoroutineScheduler()
+
+
+def start_coroutine(coroutine, entity=None):    # start a generator or async def. pass an entity to stop it when the entity gets destroyed.
+    return scheduler.start(coroutine, entity)
+
+
+
+if __name__ == '__main__':
+    from ursina import *
+    app = Ursina()
+
+    class Blinker(Entity):
+        def __init__(self, **kwargs):
+            super().__init__(model='cube', **kwargs)
+            self.start_coroutine(self.blink())
+
+        def blink(self):
+            while True:
+                self.color = color.red
+                yield wait(.5)
+                self.color = color.white
+                yield wait(.5)
+
+    b = Blinker()
+
+    async def cutscene():
+        print('waiting for space')
+        await until(lambda: held_keys['space'])
+        print('destroying blinker in 1 second')
+        await wait(1)
+        destroy(b)      # stops its coroutine too
+        await next_frame()
+        print('done')
+
+    start_coroutine(cutscene())
+    app.run()
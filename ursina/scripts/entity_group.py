@@ -0,0 +1,109 @@
+from ursina.entity import Entity
+from ursina.color import Color
+
+
+class EntityGroup:
+    '''Binds a list of entities to numpy arrays, so you can move them all with vectorized code and write the result back in one go,
+    instead of setting .position, .rotation and .scale on each entity. Requires numpy.
+
+        boids = EntityGroup([Entity(model='cube') for i in range(5000)])
+        boids.positions += velocities * time.dt     # shape (n, 3)
+        boids.push()                                # only the rows that changed get sent to the entities
+
+    positions, rotations and scales are local, like Entity.position/rotation/scale. colors is (n, 4) rgba.
+    Call pull() to read the entities' current transforms and colors back into the arrays, for example if something else moved them.
+    '''
+    def __init__(self, entities):
+        import numpy as np
+        self.entities = list(entities)
+        n = len(self.entities)
+        self.positions = np.zeros((n, 3), dtype=np.float32)
+        self.rotations = np.zeros((n, 3), dtype=np.float32)
+        self.scales = np.ones((n, 3), dtype=np.float32)
+        self.colors = np.ones((n, 4), dtype=np.float32)
+        self.pull()
+
+
+    def pull(self):     # read the transforms and colors from the entities into the arrays
+        import numpy as np
+        entities = self.entities
+        if not entities:
+            return
+        self.positions[:] = [tuple(e.getPos()) for e in entities]
+        hpr = np.array([tuple(e.getHpr()) for e in entities], dtype=np.float32)
+        self.rotations[:] = hpr[:, (1,0,2)] * Entity.rotation_directions
+        self.scales[:] = [tuple(e.getScale()) for e in entities]
+        self.colors[:] = [tuple(e.color) for e in entities]
+        self._remember()
+
+
+    def _remember(self):    # copies of what the entities currently have, to find the rows that changed in push()
+        self._pushed_positions = self.positions.copy()
+        self._pushed_rotations = self.rotations.copy()
+        self._pushed_scales = self.scales.copy()
+        self._pushed_colors = self.colors.copy()
+
+
+    def push(self, rows=None):  # write the arrays to the entities. by default only rows that changed since the last push() or pull(), or give a list of indices.
+        import numpy as np
+        if rows is None:
+            changed = np.flatnonzero(
+                (self.positions != self._pushed_positions).any(axis=1)
+                | (self.rotations != self._pushed_rotations).any(axis=1)
+                | (self.scales != self._pushed_scales).any(axis=1)
+                )
+            changed_colors = np.flatnonzero((self.colors != self._pushed_colors).any(axis=1))
+        else:
+            changed = changed_colors = np.asarray(rows, dtype=np.int64)
+
+        entities = self.entities
+        if len(changed):
+            hpr = self.rotations[changed][:, (1,0,2)] * Entity.rotation_directions
+            scales = self.scales[changed]
+            scales[scales == 0] = .001
+            transforms = np.concatenate((self.positions[changed], hpr, scales), axis=1).tolist()
+            for i, t in zip(changed.tolist(), transforms):
+                e = entities[i]
+                if e:   # skip destroyed entities
+                    e.setPosHprScale(t[0], t[1], t[2], t[3], t[4], t[5], t[6], t[7], t[8])
+                    e._invalidate_static()  # setPosHprScale() skips Entity's setters
+
+            self._pushed_positions[changed] = self.positions[changed]
+            self._pushed_rotations[changed] = self.rotations[changed]
+            self._pushed_scales[changed] = self.scales[changed]
+
+        if len(changed_colors):
+            for i, c in zip(changed_colors.tolist(), self.colors[changed_colors].tolist()):
+                e = entities[i]
+                if e:
+                    e.color = Color(c[0], c[1], c[2], c[3])
+            self._pushed_colors[changed_colors] = self.colors[changed_colors]
+
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __getitem__(self, i):
+        return self.entities[i]
+
+
+
+if __name__ == '__main__':
+    from ursina import *
+    import numpy as np
+    app = Ursina()
+
+    n = 2000
+    boids = EntityGroup([Entity(model='cube', scale=.2, color=color.random_color()) for i in range(n)])
+    boids.positions[:] = np.random.uniform(-10, 10, (n, 3))
+    velocities = np.random.uniform(-1, 1, (n, 3))
+    boids.push()
+
+    def update():
+        velocities[:] -= boids.positions * time.dt * .1     # pull toward the center
+        boids.positions += velocities * time.dt
+        boids.rotations[:, 1] += 90 * time.dt
+        boids.push()
+
+    EditorCamera()
+    app.run()
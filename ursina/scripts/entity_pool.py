@@ -0,0 +1,125 @@
+from ursina.entity import Entity
+from ursina.scene import instance as scene
+from ursina.vec3 import Vec3
+
+
+class EntityPool:
+    '''Reuses entities instead of creating and destroying them, for things that get spawned a lot, like bullets and particles.
+
+        bullets = EntityPool(Bullet, size=100, model='sphere', scale=.1)   # creates 100 disabled bullets up front
+        bullet = bullets.get(position=player.position)                      # enabled, with the attributes reset to the ones given to the pool
+        destroy(bullet)                                                     # goes back to the pool instead of getting destroyed
+
+    The model, texture, shader, collider and origin given to the pool only get set when an entity is created, since they don't usually change
+    and setting them again would load and copy them every time. If get() is given one of those, it gets set back the next time the entity is taken out.
+    on_destroy() gets called when an entity goes back to the pool, and on_enable() when it's taken out, so use those to reset your own state.
+    Use pool.clear() to destroy the entities for real.
+    '''
+    set_once = ('model', 'texture', 'shader', 'collider', 'origin', 'origin_x', 'origin_y', 'origin_z', 'texture_scale', 'texture_offset', 'async_load')
+
+    def __init__(self, entity_class=Entity, size=0, max_size=None, **kwargs):
+        self.entity_class = entity_class
+        self.kwargs = kwargs            # the attributes every entity gets reset to when taken from the pool
+        # model, texture etc. only get set when creating the entity, since setting them again would load and copy them every time
+        self._reset_kwargs = {key: value for key, value in kwargs.items() if key not in EntityPool.set_once}
+        self.max_size = max_size        # if set, entities returned to a full pool will be destroyed for real
+        self.available = []
+        self.in_use = set()
+        self.prewarm(size)
+
+
+    def _create(self):
+        e = self.entity_class(**(self.kwargs | dict(enabled=False)))
+        e._pool = self
+        e._pool_changed = ()    # keys in set_once that get() changed, which have to be set back next time
+        # remember the transform and color it started with, so get() can reset them even if they're not in kwargs
+        e._pool_defaults = dict(parent=e.parent, position=e.position, rotation=e.rotation, scale=e.scale, color=e.color)
+        return e
+
+
+    def prewarm(self, amount):   # create entities up front, so get() doesn't have to later
+        for i in range(amount):
+            self.available.append(self._create())
+
+
+    def get(self, **kwargs):
+        if self.available:
+            e = self.available.pop()
+        else:
+            e = self._create()
+
+        self.in_use.add(id(e))
+        if e not in scene.entities and e.add_to_scene_entities:  # scene.clear() might have removed it
+            scene.entities.append(e)
+
+        e.ignore = False    # scene.clear_async() sets it on everything it destroys, including pooled entities
+        values = e._pool_defaults | self._reset_kwargs
+        for key in e._pool_changed:
+            if key in self.kwargs:
+                values[key] = self.kwargs[key]
+        e._pool_changed = tuple(key for key in kwargs if key in EntityPool.set_once)
+        for key, value in (values | kwargs).items():
+            setattr(e, key, value)
+
+        e.enabled = True
+        return e
+
+
+    def release(self, entity):  # called by destroy(). puts the entity back in the pool.
+        if id(entity) not in self.in_use:
+            return
+        self.in_use.discard(id(entity))
+
+        if hasattr(entity, 'on_destroy'):
+            entity.on_destroy()
+
+        for anim in entity.animations:
+            anim.kill()
+        entity.animations.clear()
+
+        entity.enabled = False
+
+        if self.max_size is not None and len(self.available) >= self.max_size:
+            self._destroy(entity)
+            return
+
+        self.available.append(entity)
+
+
+    def _destroy(self, entity):
+        from ursina.ursinastuff import _destroy
+        entity._pool = None
+        _destroy(entity, force_destroy=True)
+
+
+    def clear(self):    # destroy all the entities that are not in use. the ones in use will get destroyed normally when you destroy them.
+        for e in self.available:
+            self._destroy(e)
+        self.available.clear()
+        self.in_use.clear()
+
+    def __len__(self):
+        return len(self.available)
+
+
+
+if __name__ == '__main__':
+    from ursina import *
+    app = Ursina()
+
+    class Bullet(Entity):
+        def update(self):
+            self.y += time.dt * 10
+            if self.y > 5:
+                destroy(self)
+
+    bullets = EntityPool(Bullet, size=50, model='sphere', scale=.2, color=color.yellow)
+
+    info_text = Text(position=window.top_left)
+
+    def update():
+        if held_keys['space']:
+            bullets.get(x=random.uniform(-2, 2), y=-4)
+        info_text.text = f'in pool: {len(bullets)}, in use: {len(bullets.in_use)}'
+
+    app.run()
@@ -7,9 +7,9 @@ class every:
             print('check collision')
 
         Using the @every decorator is the same as doing this in __init__() (on Entity):
-        self.animations.append(Sequence(Func(self.fixed_update), Wait(.1), loop=True, started=True))
-        The Sequence will call the function every .1 second, while adding it to
-        self.animations ensures the Sequence gets cleaned up when the Entity gets destroyed.
+        self.animations.append(Timer(self.fixed_update, interval=.1, entity=self).start())
+        The Timer will call the function every .1 second, while adding it to
+        self.animations ensures the Timer gets cleaned up when the Entity gets destroyed.
     '''
     decorated_methods = []  # store decorated methods here
 
@@ -17,11 +17,14 @@ def normalize_v3(arr):
 def generate_normals(vertices, triangles=None, smooth=True):
     import numpy
 
-    if not vertices:
+    if not len(vertices):
         raise ValueError("can't generate normals for a mesh with 0 vertices")
 
-    if not triangles:
+    if triangles is None or not len(triangles):
         new_tris = [(i, i+1, i+2) for i in range(0, len(vertices), 3)]
+
+    elif hasattr(triangles, '__array_interface__'):     # numpy array of indices
+        new_tris = numpy.asarray(triangles).reshape(-1, 3)
         
     elif not isinstance(triangles[0], int):
         raise TypeError(f'triangles must be ints, not {type(triangles[0])} ({triangles[0]})')
@@ -0,0 +1,106 @@
+class OrderedSet:
+    '''Insertion ordered collection with O(1) add, remove and membership checks. Also has append(), index() and indexing, so it can replace a list.
+    Items are stored by id(), so they don't need to be hashable, and iterating goes over a snapshot, so it's safe to add and remove items while looping.
+    The snapshot and the position of each item are kept until the set changes, so indexing and index() are O(1) as long as nothing gets added or removed in between.
+
+    If sort_key is given, items added out of order (for example an entity that gets enabled again) will be sorted back into place the next time the set is iterated.
+    '''
+    __slots__ = ('_items', 'sort_key', '_max_key', '_needs_sort', '_list', '_positions')
+
+    def __init__(self, iterable=(), sort_key=None):
+        self._items = dict()
+        self.sort_key = sort_key
+        self._max_key = None
+        self._needs_sort = False
+        self._list = None       # snapshot of the items in order, made when needed
+        self._positions = None  # id(item): index in _list, made when needed
+        for e in iterable:
+            self.add(e)
+
+
+    def add(self, item):
+        if id(item) in self._items:
+            return
+
+        if self.sort_key:
+            key = self.sort_key(item)
+            if self._max_key is None or key >= self._max_key:
+                self._max_key = key
+            else:
+                self._needs_sort = True
+
+        self._items[id(item)] = item
+        self._list = self._positions = None
+
+    append = add   # so it can be used in place of a list
+
+    def discard(self, item):
+        if self._items.pop(id(item), None) is not None:
+            self._list = self._positions = None
+
+    def remove(self, item):
+        if self._items.pop(id(item), None) is None:
+            raise ValueError(f'{item} not in OrderedSet')
+        self._list = self._positions = None
+
+    def clear(self):
+        self._items.clear()
+        self._list = self._positions = None
+        self._max_key = None
+        self._needs_sort = False
+
+
+    def _sort(self):
+        self._items = {id(e): e for e in sorted(self._items.values(), key=self.sort_key)}
+        self._needs_sort = False
+        self._list = self._positions = None
+
+    def _as_list(self):    # the snapshot. it's never changed, only replaced, so iterators over an old one keep working.
+        if self._needs_sort:
+            self._sort()
+        if self._list is None:
+            self._list = list(self._items.values())
+        return self._list
+
+    def __iter__(self):
+        return iter(self._as_list())
+
+    def __getitem__(self, index):
+        return self._as_list()[index]
+
+    def index(self, item):
+        if self._positions is None:
+            self._positions = {id(e): i for i, e in enumerate(self._as_list())}
+        i = self._positions.get(id(item))
+        if i is None:
+            raise ValueError(f'{item} not in OrderedSet')
+        return i
+
+    def __contains__(self, item):
+        return id(item) in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+    def __repr__(self):
+        return f'OrderedSet({list(self)})'
+
+
+
+if __name__ == '__main__':
+    class Item:
+        def __init__(self, i):
+            self.i = i
+        def __repr__(self):
+            return str(self.i)
+
+    items = [Item(i) for i in range(5)]
+    s = OrderedSet(items, sort_key=lambda e: e.i)
+    s.remove(items[1])
+    s.add(items[1])     # gets sorted back into place
+    for e in s:
+        s.discard(e)    # removing while iterating is fine
+        print(e, len(s))
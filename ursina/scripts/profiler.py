@@ -0,0 +1,136 @@
+import json
+from pathlib import Path
+from time import perf_counter
+
+
+class Profiler:
+    '''Records how long update(), input(), scripts, Sequences and shader continuous_input take, grouped by class.
+    Turned off by default, since measuring has a small cost. The engine checks profiler.enabled before timing anything.
+
+        profiler.start(trace=True)  # trace=True also records every call for profiler.export_trace()
+        profiler.show_overlay()     # show the slowest ones in the top left corner
+        print(profiler.report())
+        profiler.export_trace('trace.json')     # open in chrome://tracing or https://ui.perfetto.dev
+    '''
+    def __init__(self):
+        self.enabled = False
+        self.trace = False
+        self.max_trace_events = 1_000_000     # stop recording trace events after this, to not run out of memory if you forget to turn it off
+        self.reset()
+
+
+    def reset(self):
+        self.stats = dict()         # (category, name): [total_time, calls, max_time]
+        self.frames = 0
+        self.frame_time = 0
+        self.trace_events = []
+        self._start_time = perf_counter()
+        self._frame_start = None
+
+
+    def start(self, trace=False):
+        self.reset()
+        self.enabled = True
+        self.trace = trace
+
+    def stop(self):
+        self.enabled = False
+
+
+    def begin_frame(self):
+        self._frame_start = perf_counter()
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        end = perf_counter()
+        self.frames += 1
+        self.frame_time += end - self._frame_start
+        if self.trace:
+            self._add_trace_event('frame', 'frame', self._frame_start, end)
+        self._frame_start = None
+
+
+    def record(self, category, name, start):   # call with the perf_counter() value from before the call you want to measure
+        end = perf_counter()
+        duration = end - start
+        key = (category, name)
+        stat = self.stats.get(key)
+        if stat is None:
+            self.stats[key] = [duration, 1, duration]
+        else:
+            stat[0] += duration
+            stat[1] += 1
+            if duration > stat[2]:
+                stat[2] = duration
+
+        if self.trace:
+            self._add_trace_event(category, name, start, end)
+
+
+    def _add_trace_event(self, category, name, start, end):
+        if len(self.trace_events) >= self.max_trace_events:
+            return
+        self.trace_events.append((category, name, start, end))
+
+
+    def top(self, n=10, category=None):  # returns [(category, name, total_time, calls, max_time), ...] sorted by total time
+        stats = [(key[0], key[1], *value) for key, value in self.stats.items() if category is None or key[0] == category]
+        stats.sort(key=lambda e: e[2], reverse=True)
+        return stats[:n]
+
+
+    def report(self, n=20, category=None):
+        frames = max(self.frames, 1)
+        lines = [f'{self.frames} frames, {self.frame_time / frames * 1000:.2f} ms/frame', f'{"category":<10} {"name":<32} {"ms/frame":>9} {"calls/frame":>12} {"max ms":>8}']
+        for cat, name, total, calls, max_time in self.top(n, category):
+            lines.append(f'{cat:<10} {name[:32]:<32} {total / frames * 1000:>9.3f} {calls / frames:>12.1f} {max_time * 1000:>8.3f}')
+        return '\n'.join(lines)
+
+
+    def export_trace(self, path='trace.json'):   # save as chrome trace event json
+        events = [dict(name=name, cat=cat, ph='X', ts=(start - self._start_time) * 1_000_000, dur=(end - start) * 1_000_000, pid=0, tid=0)
+            for cat, name, start, end in self.trace_events]
+
+        path = Path(path)
+        with path.open('w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return path
+
+
+    def show_overlay(self, **kwargs):
+        from ursina.prefabs.profiler_overlay import ProfilerOverlay
+        if not self.enabled:
+            self.start()
+        return ProfilerOverlay(**kwargs)
+
+
+profiler = Profiler()
+
+
+
+if __name__ == '__main__':
+    from ursina import *
+    app = Ursina()
+
+    class SlowEntity(Entity):
+        def update(self):
+            sum(range(10000))
+
+    class FastEntity(Entity):
+        def update(self):
+            pass
+
+    for i in range(10):
+        SlowEntity()
+        FastEntity()
+
+    profiler.start(trace=True)
+    profiler.show_overlay()
+
+    def input(key):
+        if key == 'space':
+            print(profiler.report())
+            print('saved trace to:', profiler.export_trace('trace.json'))
+
+    app.run()
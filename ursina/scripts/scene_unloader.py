@@ -0,0 +1,80 @@
+from time import perf_counter
+from ursina import application
+from ursina.entity import Entity
+from ursina.scene import instance as scene
+from ursina.scripts.tween_engine import tween_engine
+from ursina.scripts import timers
+
+
+class SceneUnloader(Entity):
+    '''Destroys the non-eternal entities in the scene over several frames, spending at most budget milliseconds per frame.
+    Returned by scene.clear_async(). Entities that get created after this started are not touched, so you can play a transition while the old level unloads.
+
+        unloader = scene.clear_async(budget=4, on_complete=load_next_level)
+        loading_bar.value = unloader.progress    # from 0 to 1
+    '''
+    def __init__(self, budget=4, on_complete=None, **kwargs):
+        super().__init__(eternal=True, ignore_paused=True, **kwargs)
+        self.budget = budget            # milliseconds per frame
+        self.on_complete = on_complete
+        self.finished = False
+
+        # pop() from the end destroys the newest ones first, since they're usually children of older ones and removing nodes back to front is faster
+        self.to_destroy = [e for e in scene.entities if not e.eternal]
+        self.total = len(self.to_destroy)
+        for e in self.to_destroy:
+            e.ignore = True     # stop updating and receiving input while waiting to get destroyed
+
+        application.sequences.clear()   # stop the old level's animations and invokes. new ones will keep working.
+        tween_engine.clear()
+        timers.scheduler.clear()
+
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 1
+        return 1 - (len(self.to_destroy) / self.total)
+
+
+    def update(self):
+        from ursina.ursinastuff import _destroy
+        end_time = perf_counter() + (self.budget / 1000)
+        while self.to_destroy:
+            e = self.to_destroy.pop()
+            if e and not e.eternal:   # might've been destroyed already, together with its parent
+                _destroy(e)
+            if perf_counter() >= end_time:
+                return
+
+        self.finished = True
+        self.eternal = False
+        _destroy(self)
+        if self.on_complete:
+            self.on_complete()
+
+
+
+if __name__ == '__main__':
+    from ursina import *
+    app = Ursina()
+
+    def load_level():
+        for i in range(5000):
+            Entity(model='cube', position=(random.uniform(-20,20), random.uniform(-20,20), random.uniform(0,40)), scale=.2, color=color.random_color())
+
+    load_level()
+    progress_text = Text(eternal=True, position=window.top_left)
+    unloader = None
+
+    def input(key):
+        global unloader
+        if key == 'space':
+            unloader = scene.clear_async(budget=2, on_complete=load_level)
+
+    def update():
+        if unloader:
+            progress_text.text = f'unloading: {unloader.progress:.0%}'
+
+    EditorCamera(eternal=True)
+    app.run()
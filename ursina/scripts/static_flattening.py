@@ -0,0 +1,129 @@
+import time
+from math import inf
+from panda3d.core import NodePath
+
+
+class StaticFlattener:
+    '''Handles Entity.static. A static entity's children get copied into one render-only node that's flattened with flattenStrong(),
+    so they cost a few draw calls instead of one per entity. The original entities are hidden, but stay where they are,
+    so colliders, raycasts and your own code keep working on them.
+
+    Changing a descendant (transform, model, color, texture, enabled, visible, parent, destroy) splits the copy up again right away,
+    showing the originals. It gets rebuilt once nothing in the subtree has changed for rebuild_delay seconds,
+    so moving something every frame doesn't cause a rebuild every frame.
+    '''
+    def __init__(self):
+        self.rebuild_delay = .5     # seconds, unscaled
+        self.time = 0
+        self._pending = dict()      # static entity: time it last changed
+
+
+    def set_static(self, entity, value):
+        if value:
+            mark(entity, entity)
+            self._pending[entity] = -inf    # flatten at the end of this frame, even if children get added until then
+        else:
+            self._pending.pop(entity, None)
+            unflatten(entity)
+            mark(entity, entity._static_root)
+
+
+    def invalidate(self, entity):   # called when something in a static entity's subtree changed
+        if getattr(entity, '_static_copy', None) is not None:
+            unflatten(entity)
+        if self._pending.get(entity) != -inf:
+            self._pending[entity] = self.time
+        if entity._static_root is not None:    # the outer one has a copy of this one's copy
+            self.invalidate(entity._static_root)
+
+
+    def update(self):   # called by the engine every frame
+        self.time += time.dt_unscaled
+        if not self._pending:
+            return
+
+        for entity, changed_at in tuple(self._pending.items()):
+            if not entity or not entity.static:     # destroyed, or not static anymore
+                del self._pending[entity]
+            elif self.time - changed_at >= self.rebuild_delay:
+                del self._pending[entity]
+                flatten(entity)
+
+
+    def clear(self):
+        self._pending.clear()
+
+
+scheduler = StaticFlattener()
+
+
+def mark(entity, static_root):    # let the descendants know which static entity to notify when they change. nested static entities handle their own subtree.
+    for c in entity.children:
+        c._static_root = static_root
+        if not c.static:
+            mark(c, static_root)
+
+
+def flatten(entity):
+    unflatten(entity)
+    copy = NodePath(f'{entity.name}_static')
+    hidden = []
+    for c in entity.children:
+        if not c.enabled or not c.visible:
+            continue
+        c.copy_to(copy)
+        c.hide()
+        hidden.append(c)
+
+    # the copy is only for rendering, so remove anything that isn't
+    for np in copy.find_all_matches('**/+CollisionNode'):
+        np.remove_node()
+    for np in copy.find_all_matches('**/@@*'):    # stashed, like disabled entities
+        np.remove_node()
+    for np in [np for np in copy.find_all_matches('**') if np.node().is_overall_hidden()]:
+        if not np.is_empty():
+            np.remove_node()
+    for np in copy.find_all_matches('**'):
+        if np.has_python_tag('Entity'):
+            np.clear_python_tag('Entity')
+
+    copy.flatten_strong()
+    copy.reparent_to(entity)
+    entity._static_copy = copy
+    entity._static_hidden = hidden
+
+
+def unflatten(entity):
+    copy = getattr(entity, '_static_copy', None)
+    if copy is None:
+        return
+    if not copy.is_empty():
+        copy.remove_node()
+    for c in entity._static_hidden:
+        if c and c.visible:
+            c.show()
+    entity._static_copy = None
+    entity._static_hidden = []
+
+
+
+if __name__ == '__main__':
+    from ursina import *
+    app = Ursina()
+
+    level = Entity(static=True)
+    for x in range(40):
+        for z in range(40):
+            Entity(parent=level, model='cube', position=(x, random.random(), z), color=color.random_color(), collider='box')
+
+    info = Text(position=window.top_left)
+
+    def update():
+        info.text = f'flattened: {getattr(level, "_static_copy", None) is not None}'
+
+    def input(key):
+        if key == 'space':  # splits it up again, then rebuilds after half a second
+            random.choice(level.children).y += 1
+
+    EditorCamera()
+    app.run()
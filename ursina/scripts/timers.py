@@ -0,0 +1,179 @@
+import time
+from heapq import heappush, heappop, heapify
+from itertools import count
+from ursina import application
+
+
+class Timer:
+    '''Returned by invoke() and destroy(entity, delay=...). Call kill() to cancel it, like the Sequence it used to be.
+    If interval is set, the function gets called again every interval seconds until killed, like @every.
+    If entity is set, the timer waits while the entity is disabled or ignored, and gets killed when the entity is destroyed.'''
+    def __init__(self, function, args=(), kwargs=None, delay=0, interval=None, unscaled=False, ignore_paused=False, entity=None):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs if kwargs else dict()
+        self.delay = delay
+        self.interval = interval
+        self.unscaled = unscaled
+        self.ignore_paused = ignore_paused
+        self.entity = entity
+        self.started = False
+        self.paused = False
+        self.finished = False
+        self._clock = int(unscaled) * 2 + int(ignore_paused)   # which of the scheduler's clocks and heaps it uses
+        self._due = 0
+        self._remaining = 0
+        self._version = 0   # changes every time it gets rescheduled or cancelled, so old entries in the heap can be skipped
+
+
+    def start(self):
+        self.started = True
+        self.paused = False
+        self.finished = False
+        scheduler._push(self, scheduler.clocks[self._clock] + self.delay)
+        return self
+
+    def pause(self):
+        if not self.started or self.paused:
+            return
+        self._remaining = max(self._due - scheduler.clocks[self._clock], 0)
+        self.paused = True
+        scheduler._cancel(self)
+
+    def resume(self):
+        if not self.started or not self.paused:
+            return
+        self.paused = False
+        scheduler._push(self, scheduler.clocks[self._clock] + self._remaining)
+
+    def kill(self):
+        if self.started and not self.paused:
+            scheduler._cancel(self)
+        self.started = False
+
+    def finish(self):   # call the function now instead of waiting and stop
+        if not self.started:
+            return
+        self.kill()
+        self.finished = True
+        self.function(*self.args, **self.kwargs)
+
+    @property
+    def time_left(self):
+        if self.paused:
+            return self._remaining
+        if not self.started:
+            return 0
+        return max(self._due - scheduler.clocks[self._clock], 0)
+
+    def __repr__(self):
+        return f'Timer({getattr(self.function, "__name__", self.function)}, delay={self.delay}, interval={self.interval})'
+
+
+
+class TimerScheduler:
+    '''Keeps the waiting timers in heaps sorted by when they're due, so each frame only costs as much as the timers that fire,
+    no matter how many are waiting. Pausing doesn't touch the timers either, the clocks they use just stop.'''
+    def __init__(self):
+        self.clocks = [0, 0, 0, 0]              # scaled, scaled ignoring pause, unscaled, unscaled ignoring pause
+        self._heaps = [[], [], [], []]          # (due, counter, version, timer), one for each clock
+        self._blocked = []                      # (version, timer) that are due, but their entity is disabled or ignored
+        self._counter = count()
+        self._cancelled = 0                     # number of old entries in the heaps. they get cleaned up when there are a lot of them.
+
+
+    def _push(self, timer, due):
+        timer._version += 1
+        timer._due = due
+        heappush(self._heaps[timer._clock], (due, next(self._counter), timer._version, timer))
+
+
+    def _cancel(self, timer):
+        timer._version += 1
+        self._cancelled += 1
+        if self._cancelled > 1024 and self._cancelled > sum(len(heap) for heap in self._heaps) // 2:
+            for heap in self._heaps:
+                heap[:] = [e for e in heap if e[2] == e[3]._version]
+                heapify(heap)
+            self._cancelled = 0
+
+
+    def update(self):   # called by the engine every frame
+        clocks = self.clocks
+        if not application.paused:
+            clocks[0] += time.dt
+            clocks[2] += time.dt_unscaled
+        clocks[1] += time.dt
+        clocks[3] += time.dt_unscaled
+
+        due = []
+        if self._blocked:
+            blocked = self._blocked
+            self._blocked = []
+            for version, timer in blocked:
+                if version == timer._version:
+                    timer._due = self.clocks[timer._clock]   # so @every continues from now instead of catching up
+                    due.append(timer)
+
+        for heap, now in zip(self._heaps, clocks):
+            while heap and heap[0][0] <= now:
+                _, _, version, timer = heappop(heap)
+                if version == timer._version:
+                    due.append(timer)
+                else:
+                    self._cancelled -= 1
+
+        for timer in due:
+            if not timer.started or timer.paused:   # got killed or paused by an earlier one this frame
+                continue
+
+            e = timer.entity
+            if e is not None:
+                if not e:   # entity's node got removed without destroy()
+                    timer.started = False
+                    timer._version += 1
+                    continue
+                if not e.enabled or e.ignore:
+                    self._blocked.append((timer._version, timer))
+                    continue
+
+            if timer.interval is None:
+                timer.started = False
+                timer.finished = True
+                timer._version += 1
+            else:
+                # schedule from when it was due instead of now, so it doesn't drift, but don't try to catch up after a long freeze
+                self._push(timer, max(timer._due + timer.interval, clocks[timer._clock]))
+
+            timer.function(*timer.args, **timer.kwargs)
+
+
+    def clear(self):
+        for heap in self._heaps:
+            for _, _, version, timer in heap:
+                if version == timer._version:
+                    timer.started = False
+                    timer._version += 1
+            heap.clear()
+        for version, timer in self._blocked:
+            timer.started = False
+        self._blocked.clear()
+        self._cancelled = 0
+
+
+scheduler = TimerScheduler()
+
+
+
+if __name__ == '__main__':
+    from ursina import *
+    app = Ursina()
+
+    timers = [invoke(print_on_screen, i, delay=i/10) for i in range(10)]
+    timers[5].kill()
+
+    def input(key):
+        if key == 'space':
+            application.paused = not application.paused
+
+    app.run()
@@ -0,0 +1,273 @@
+import time
+import importlib.util
+from ursina import application
+from ursina.vec2 import Vec2
+from ursina.vec3 import Vec3
+from ursina.vec4 import Vec4
+from ursina.color import Color
+from ursina.curve import vectorize
+
+
+numpy_available = importlib.util.find_spec('numpy') is not None     # Entity.animate() falls back to Sequences without numpy
+
+
+class Tween:
+    '''Returned by Entity.animate() when the tween engine is used. Works like the Sequence it replaces: start(), pause(), resume(), kill() and finish().'''
+    def __init__(self, entity, name, start_value, end_value, duration=.1, delay=0, curve=None, loop=False, resolution=None, time_step=None, unscaled=False, ignore_paused=False):
+        self.entity = entity
+        self.name = name
+        self.start_value = start_value
+        self.end_value = end_value
+        self.duration = duration
+        self.delay = delay
+        self.curve = curve
+        self.loop = loop
+        self.resolution = resolution    # if set, the value only changes in this many steps, like the old Sequence based animations
+        self.time_step = time_step      # if set, advance this much every frame instead of time.dt
+        self.unscaled = unscaled
+        self.ignore_paused = ignore_paused
+        self.started = False
+        self.paused = False
+        self._t = 0             # time since start, including delay. stored in the engine's arrays while the tween is running.
+        self._row = None        # index in the engine's arrays while running
+
+        self._size = size = min(len(start_value), len(end_value)) if hasattr(start_value, '__len__') else 1
+        if isinstance(start_value, (int, float)):
+            self._make = _to_float
+        elif isinstance(start_value, Color):
+            self._make = _to_color
+        elif isinstance(start_value, (tuple, list)):
+            cls = type(start_value)
+            self._make = lambda v: cls(v[:size])
+        else:
+            cls = type(start_value)
+            self._make = lambda v: cls(*v[:size])
+
+
+    @staticmethod
+    def can_tween(a, b):  # numbers, vectors, colors and tuples/lists of numbers. everything else uses a Sequence instead.
+        if isinstance(a, (int, float)) and not isinstance(a, bool):
+            return isinstance(b, (int, float))
+        if isinstance(a, (Vec2, Vec3, Vec4, tuple, list)) and hasattr(b, '__len__'):
+            return 0 < min(len(a), len(b)) <= 4 and all(isinstance(e, (int, float)) for e in (*a, *b))
+        return False
+
+
+    @property
+    def t(self):
+        if self._row is not None:
+            return float(tween_engine.elapsed[self._row])
+        return self._t
+
+    @t.setter
+    def t(self, value):
+        self._t = value
+        if self._row is not None:
+            tween_engine.elapsed[self._row] = value
+
+    @property
+    def finished(self):
+        return self.t >= self.delay + self.duration
+
+    def start(self):
+        self.t = 0
+        self.started = True
+        self.paused = False
+        tween_engine.add(self)
+        return self
+
+    def pause(self):
+        self.paused = True
+        tween_engine.remove(self)
+
+    def resume(self):
+        self.paused = False
+        if self.started:
+            tween_engine.add(self)
+
+    def kill(self):
+        tween_engine.remove(self)
+        self.started = False
+
+    def finish(self):
+        tween_engine.remove(self)
+        self._t = self.delay + self.duration
+        self.started = False
+        if self.entity:
+            setattr(self.entity, self.name, self.value_at(1))
+
+    def value_at(self, t):   # the value at t, from 0 to 1, after applying the curve
+        if self.curve:
+            t = self.curve(t)
+        size = self._size
+        start = (self.start_value,) if size == 1 else self.start_value
+        end = (self.end_value,) if size == 1 else self.end_value
+        return self._make([start[i] + (end[i] - start[i]) * t for i in range(size)])
+
+    def __repr__(self):
+        return f'Tween({self.entity}.{self.name}, {self.start_value} -> {self.end_value}, duration={self.duration})'
+
+
+def _to_float(v):
+    return v[0]
+
+def _to_color(v):
+    return Color(v[0], v[1], v[2], v[3])
+
+
+
+class TweenEngine:
+    '''Keeps every running Tween as a row in numpy arrays and advances them all in one vectorized pass per frame,
+    instead of each animation being a Sequence of Funcs. Values are calculated for the exact time every frame, instead of in steps.'''
+    def __init__(self):
+        self.tweens = []    # the running tweens, in the same order as the rows in the arrays
+        self._capacity = 0
+        self._curves = dict()   # curve function: id
+        self._vectorized_curves = []
+
+
+    _columns = (    # name, dtype, shape of each row
+        ('elapsed', 'f8', ()), ('delay', 'f8', ()), ('duration', 'f8', ()), ('time_step', 'f8', ()), ('resolution', 'f8', ()),
+        ('start_values', 'f8', (4,)), ('deltas', 'f8', (4,)), ('curve_ids', 'i8', ()), ('unscaled', '?', ()), ('ignore_paused', '?', ()), ('loop', '?', ()),
+        )
+
+    def _allocate(self, capacity):
+        import numpy as np
+        n = len(self.tweens)
+        for name, dtype, shape in self._columns:
+            new = np.zeros((capacity, *shape), dtype=dtype)
+            if self._capacity:
+                new[:n] = getattr(self, name)[:n]
+            setattr(self, name, new)
+        self._capacity = capacity
+
+
+    def _curve_id(self, curve):
+        if curve not in self._curves:
+            self._curves[curve] = len(self._vectorized_curves)
+            self._vectorized_curves.append(vectorize(curve))
+        return self._curves[curve]
+
+
+    def add(self, tween):
+        if tween._row is not None:
+            return
+        i = len(self.tweens)
+        if i >= self._capacity:
+            self._allocate(max(64, self._capacity * 2))
+
+        size = tween._size
+        start = (tween.start_value,) if size == 1 else tuple(tween.start_value)
+        end = (tween.end_value,) if size == 1 else tuple(tween.end_value)
+        self.start_values[i, :size] = start[:size]
+        self.deltas[i, :size] = [end[j] - start[j] for j in range(size)]
+        self.elapsed[i] = tween._t
+        self.delay[i] = tween.delay
+        self.duration[i] = tween.duration
+        self.time_step[i] = tween.time_step or 0
+        self.resolution[i] = tween.resolution or 0
+        self.curve_ids[i] = self._curve_id(tween.curve)
+        self.unscaled[i] = tween.unscaled
+        self.ignore_paused[i] = tween.ignore_paused
+        self.loop[i] = tween.loop
+        tween._row = i
+        self.tweens.append(tween)
+
+
+    def remove(self, tween):     # O(1), moves the last row into the removed one's place
+        i = tween._row
+        if i is None:
+            return
+        tween._t = float(self.elapsed[i])
+        tween._row = None
+        last = len(self.tweens) - 1
+        if i != last:
+            for name, _, _ in self._columns:
+                array = getattr(self, name)
+                array[i] = array[last]
+            moved = self.tweens[last]
+            moved._row = i
+            self.tweens[i] = moved
+        self.tweens.pop()
+
+
+    def update(self):   # called by the engine every frame
+        n = len(self.tweens)
+        if not n:
+            return
+        import numpy as np
+
+        elapsed = self.elapsed[:n]
+        step = np.where(self.unscaled[:n], time.dt_unscaled, time.dt)
+        step = np.where(self.time_step[:n] > 0, self.time_step[:n], step)
+        if application.paused:
+            step = step * self.ignore_paused[:n]
+        elapsed += step
+
+        delay = self.delay[:n]
+        duration = self.duration[:n]
+        local = elapsed - delay
+        active = np.flatnonzero((local >= 0) & (step > 0))     # done with the delay and not paused
+        if not len(active):
+            return
+
+        duration = duration[active]
+        t = np.divide(local[active], duration, out=np.ones(len(active)), where=duration > 0)
+        np.clip(t, 0, 1, out=t)
+        resolution = self.resolution[active]
+        stepped = resolution > 0
+        if stepped.any():
+            t[stepped] = np.floor(t[stepped] * resolution[stepped]) / resolution[stepped]
+
+        curve_ids = self.curve_ids[active]
+        for curve_id in np.unique(curve_ids):
+            mask = curve_ids == curve_id
+            t[mask] = self._vectorized_curves[curve_id](t[mask])
+
+        values = (self.start_values[active] + self.deltas[active] * t[:, None]).tolist()
+        tweens = [self.tweens[i] for i in active.tolist()]  # look them up first, since setting a value could start or kill tweens
+        finished = (local[active] >= duration).tolist()
+        done = []
+        for tween, value, is_finished in zip(tweens, values, finished):
+            if not tween.entity:    # entity's node got removed without destroy()
+                tween.kill()
+                continue
+            setattr(tween.entity, tween.name, tween._make(value))
+            if is_finished:
+                done.append(tween)
+
+        for tween in done:
+            if tween._row is None:   # got killed or restarted by a setter
+                continue
+            if tween.loop:
+                period = tween.delay + tween.duration
+                i = tween._row
+                self.elapsed[i] -= period
+                if self.elapsed[i] >= period:   # if delta time is too big, start over so it doesn't get stuck, like Sequence does
+                    self.elapsed[i] = 0
+            else:
+                self.remove(tween)
+                tween.started = False
+
+
+    def clear(self):
+        for tween in self.tweens:
+            tween._row = None
+            tween.started = False
+        self.tweens.clear()
+
+
+tween_engine = TweenEngine()
+
+
+if __name__ == '__main__':
+    from ursina import *
+    app = Ursina()
+
+    for i in range(1000):
+        e = Entity(model='cube', scale=.1, x=random.uniform(-8,8), y=random.uniform(-4,4), color=color.random_color())
+        e.animate('rotation_z', 360, duration=random.uniform(1,3), curve=curve.linear, loop=True)
+        e.animate('color', color.white, duration=2, delay=random.random(), curve=curve.in_out_sine_boomerang, loop=True)
+
+    print_on_screen(f'{len(tween_engine.tweens)} tweens', position=window.top_left)
+    app.run()
@@ -0,0 +1,169 @@
+import time
+from heapq import heappush, heappop
+from itertools import count
+from math import inf
+from panda3d.core import Point3
+from time import perf_counter
+from ursina import application
+from ursina.scripts.profiler import profiler
+
+
+class UpdateLOD:
+    '''Assign to Entity.update_lod to call the entity's update() less often the further away it is.
+
+        levels: (max_distance, interval) pairs, checked in order. interval is how many frames to wait between updates,
+        or how many seconds if seconds=True, so (50, 1/10) would update at 10 hz within 50 units.
+        offscreen: interval to use when the entity is outside the camera's view. None to only use distance.
+        target: what to measure distance to. defaults to camera.
+
+        Inside update(), time.dt is the time since the entity's last update, so movement code works the same at any rate.
+    '''
+    def __init__(self, levels=((20, 1), (50, 4), (inf, 16)), offscreen=None, seconds=False, target=None):
+        self.levels = levels
+        self.offscreen = offscreen
+        self.seconds = seconds
+        self.target = target
+
+
+    def get_interval(self, entity):
+        from ursina import camera
+        if self.offscreen is not None and not self.is_in_view(entity):
+            return self.offscreen
+
+        dist = entity.get_distance(self.target if self.target else camera)
+        for max_distance, interval in self.levels:
+            if dist <= max_distance:
+                return interval
+
+        return self.levels[-1][1]
+
+
+    @staticmethod
+    def is_in_view(entity):    # tests the entity's bounds against the camera's frustum. always True without a camera, like when running headless.
+        cam = getattr(application.base, 'cam', None)
+        cam_node = getattr(application.base, 'camNode', None)
+        if cam is None or cam_node is None:
+            return True
+
+        bounds = entity.get_bounds()
+        if bounds.is_empty() or bounds.is_infinite() or entity.get_parent().is_empty():  # nothing to render, so use its position
+            return cam_node.is_in_view(cam.get_relative_point(entity, Point3(0,0,0)))
+
+        bounds = bounds.make_copy()     # it's in the parent's space
+        bounds.xform(entity.get_parent().get_transform(cam).get_mat())
+        return bool(cam_node.get_lens().make_bounds().contains(bounds))
+
+
+
+class UpdateLODScheduler:
+    '''Keeps entities with an update_lod in heaps sorted by when they should update next,
+    so each frame only touches the entities that are due instead of checking all of them.'''
+    def __init__(self):
+        self.frame = 0
+        self.time = 0
+        self._frame_heap = []   # (due_frame, counter, entry)
+        self._time_heap = []    # (due_time, counter, entry)
+        self._entries = dict()  # id(entity): [entity, time of last update]. heap items whose entry isn't in here anymore are stale and get skipped.
+        self._counter = count()
+
+
+    def _schedule(self, entry, delay_fraction=1):
+        e = entry[0]
+        interval = e.update_lod.get_interval(e)
+        if e.update_lod.seconds:
+            heappush(self._time_heap, (self.time + (interval * delay_fraction), next(self._counter), entry))
+        else:
+            heappush(self._frame_heap, (self.frame + max(round(max(int(interval), 1) * delay_fraction), 1), next(self._counter), entry))
+
+
+    def add(self, entity):
+        if id(entity) in self._entries:
+            return
+
+        entry = [entity, self.time]
+        self._entries[id(entity)] = entry
+        # spread the first update over the interval, so entities created on the same frame don't all update on the same frame after that.
+        self._schedule(entry, delay_fraction=(entity._scene_order * .618) % 1)
+
+
+    def discard(self, entity):
+        self._entries.pop(id(entity), None)
+
+    def __contains__(self, entity):
+        return id(entity) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._frame_heap.clear()
+        self._time_heap.clear()
+        self._entries.clear()
+
+
+    def update(self):
+        self.frame += 1
+        self.time += time.dt
+
+        due = []
+        while self._frame_heap and self._frame_heap[0][0] <= self.frame:
+            due.append(heappop(self._frame_heap)[2])
+        while self._time_heap and self._time_heap[0][0] <= self.time:
+            due.append(heappop(self._time_heap)[2])
+
+        if not due:
+            return
+
+        profiling = profiler.enabled
+        dt = time.dt
+        for entry in due:
+            e = entry[0]
+            if self._entries.get(id(e)) is not entry:
+                continue
+
+            if not e.ignore and not (application.paused and e.ignore_paused is False):
+                time.dt = self.time - entry[1]
+
+                if hasattr(e, 'update') and callable(e.update):
+                    if profiling: t = perf_counter()
+                    e.update()
+                    if profiling: profiler.record('update', e.__class__.__name__, t)
+
+                if hasattr(e, 'scripts'):
+                    for script in e.scripts:
+                        if script.enabled and hasattr(script, 'update') and callable(script.update):
+                            if profiling: t = perf_counter()
+                            script.update()
+                            if profiling: profiler.record('script', script.__class__.__name__, t)
+
+                if e.shader:
+                    for key, value in e.shader.continuous_input.items():
+                        e.set_shader_input(key, value())
+
+            if self._entries.get(id(e)) is not entry:   # got destroyed, disabled or unthrottled by its own update
+                continue
+
+            entry[1] = self.time
+            self._schedule(entry)
+
+        time.dt = dt
+
+
+scheduler = UpdateLODScheduler()
+
+
+
+if __name__ == '__main__':
+    from ursina import *
+    app = Ursina()
+
+    class NPC(Entity):
+        def update(self):
+            self.rotation_y += 90 * time.dt   # time.dt is the time since the last update, so they all rotate at the same speed
+
+    for z in range(40):
+        for x in range(-10, 10):
+            NPC(model='cube', position=(x*2, 0, z*2), scale=.5, update_lod=UpdateLOD(levels=((10, 1), (30, 8), (inf, 32))))
+
+    EditorCamera()
+    app.run()
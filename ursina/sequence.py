@@ -28,6 +28,8 @@ class Sequence:
         self.funcs = []
         self.func_call_time = []
         self.func_finished_statuses = []
+        self._call_order = []    # indices of funcs sorted by call time
+        self._cursor = 0        # index into _call_order of the next func to call, so update() only has to look at the ones that are due
         self.paused = False
         self.entity = None  # you can assign this to make the sequence pause when the entity is disabled or .ignore is True
 
@@ -53,6 +55,9 @@ class Sequence:
                 self.func_call_time.append(self.duration)
                 self.func_finished_statuses.append(False)
 
+        self._call_order = sorted(range(len(self.funcs)), key=self.func_call_time.__getitem__)
+        self._cursor = 0
+
         # print('-----------')
     def __str__(self):
         return '\n'.join([str(e) for e in zip(self.funcs, self.func_call_time, self.func_finished_statuses)])
@@ -80,6 +85,7 @@ class Sequence:
         for i, f in enumerate(self.funcs):
             self.func_finished_statuses[i] = False
 
+        self._cursor = 0
         self.t = 0
         self.started = True
         self.paused = False
@@ -126,9 +132,13 @@ class Sequence:
         else:
             self.t += self.time_step
 
-        for i, f in enumerate(self.funcs):
-            if not self.func_finished_statuses[i] and self.func_call_time[i] <= self.t:
-                f()
+        while self._cursor < len(self._call_order):
+            i = self._call_order[self._cursor]
+            if self.func_call_time[i] > self.t:
+                break
+            self._cursor += 1
+            if not self.func_finished_statuses[i]:
+                self.funcs[i]()
                 self.func_finished_statuses[i] = True
 
 
@@ -136,6 +146,7 @@ class Sequence:
             if self.loop:
                 for i, f in enumerate(self.funcs):
                     self.func_finished_statuses[i] = False
+                self._cursor = 0
 
                 if time.dt > self.duration: # if delta time is too big, set t to 0 so it doesn't get stuck, but allow desync.
                     self.t = 0
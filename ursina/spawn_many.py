@@ -0,0 +1,126 @@
+from copy import copy
+from panda3d.core import NodePath
+from ursina import application, Entity, Color
+from ursina.texture import Texture
+from ursina.mesh_importer import load_model
+from ursina.texture_importer import load_texture
+
+
+def spawn_many(cls=Entity, count=1, shared_kwargs=None, per_instance_arrays=None):
+    '''Creates count entities at once and returns them in a list. Faster than calling cls() in a for loop, since the model,
+    texture and shader in shared_kwargs only get looked up once, and position, rotation, scale and color get set directly.
+    If cls uses Entity's __init__ and model setter, the shared model gets attached after __init__ instead of going through the model setter.
+
+        trees = spawn_many(Entity, 1000, dict(model='cube', texture='brick'), dict(position=positions, color=colors))
+
+    per_instance_arrays: dict of attribute name: list (or numpy array) with one value per entity.
+    '''
+    shared_kwargs = dict(shared_kwargs) if shared_kwargs else dict()
+    per_instance_arrays = per_instance_arrays if per_instance_arrays else dict()
+
+    for name, values in per_instance_arrays.items():
+        if len(values) != count:
+            raise ValueError(f'per_instance_arrays[{name!r}] has {len(values)} values, but count is {count}')
+
+    model = shared_kwargs.pop('model', None)
+    if isinstance(model, str):  # find it once and copy it, instead of searching the asset folders for every entity
+        name = model
+        model = load_model(name, application.asset_folder)
+        if not model:
+            model = load_model(name, application.internal_models_compressed_folder)
+        if not model:
+            if application.raise_exception_on_missing_model:
+                raise ValueError(f"missing model: '{name}'")
+            model = name    # let the Entity print the missing model warning
+        else:
+            model.name = name
+
+    if isinstance(shared_kwargs.get('texture'), str):
+        texture = load_texture(shared_kwargs['texture'])
+        if texture:
+            shared_kwargs['texture'] = texture
+
+    # the model can be attached after __init__ instead of going through the model setter, unless cls changes how that works or other shared kwargs need the model first
+    direct = (isinstance(model, NodePath) and cls.__init__ is Entity.__init__ and cls.model is Entity.model
+        and shared_kwargs.keys().isdisjoint(_needs_model))
+    texture = shared_kwargs.pop('texture', None)
+
+    # numpy arrays are a lot faster to iterate after converting them to lists
+    arrays = {name: values.tolist() if hasattr(values, 'tolist') else values for name, values in per_instance_arrays.items()}
+    positions = arrays.pop('position', None)
+    rotations = arrays.pop('rotation', None)
+    scales = arrays.pop('scale', None)
+    colors = arrays.pop('color', None)
+    rotation_directions = cls.rotation_directions
+
+    entities = []
+    for i in range(count):
+        if texture is not None:
+            shared_kwargs['texture'] = copy(texture) if isinstance(texture, Texture) else texture    # each entity gets its own, like with load_texture()
+        if direct:
+            e = cls(**shared_kwargs)
+            e._model = copy(model)
+            e._apply_model()
+        else:
+            if model is not None:
+                shared_kwargs['model'] = copy(model) if not isinstance(model, str) else model
+            e = cls(**shared_kwargs)
+
+        if positions is not None:
+            p = positions[i]
+            if len(p) == 3:
+                e.setPos(p[0], p[1], p[2])
+            else:
+                e.position = p
+
+        if rotations is not None:
+            r = rotations[i]
+            if len(r) == 3:
+                e.setHpr(r[1]*rotation_directions[0], r[0]*rotation_directions[1], r[2]*rotation_directions[2])
+            else:
+                e.rotation = r
+
+        if scales is not None:
+            s = scales[i]
+            if isinstance(s, (int, float)):
+                s = s or .001
+                e.setScale(s, s, s)
+            elif len(s) == 3:
+                e.setScale(s[0] or .001, s[1] or .001, s[2] or .001)
+            else:
+                e.scale = s
+
+        if colors is not None:
+            c = colors[i]
+            if not isinstance(c, (Color, str)) and len(c) == 3:
+                c = Color(c[0], c[1], c[2], 1)
+            e.color = c
+
+        for name, values in arrays.items():
+            setattr(e, name, values[i])
+
+        e._invalidate_static()  # position, rotation and scale were set on the NodePath directly
+
+        entities.append(e)
+
+    return entities
+
+
+_needs_model = ('async_load', 'origin', 'origin_x', 'origin_y', 'origin_z', 'collider', 'shader', 'texture_scale', 'texture_offset',
+    'tileset_size', 'tile_coordinate', 'alpha', 'render_queue', 'visible_self')
+
+
+if __name__ == '__main__':
+    from ursina import *
+    from time import perf_counter
+    app = Ursina()
+
+    positions = [(x, 0, z) for z in range(100) for x in range(100)]
+    colors = [color.hsv(x*3.6, .5, z/100) for x, _, z in positions]
+
+    t = perf_counter()
+    spawn_many(Entity, 10_000, dict(model='cube', texture='white_cube'), dict(position=positions, color=colors, scale=[.9 for e in positions]))
+    print('spawn_many:', perf_counter() - t)
+
+    EditorCamera(position=(50, 0, 50))
+    app.run()
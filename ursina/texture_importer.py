@@ -2,11 +2,13 @@ from pathlib import Path
 from copy import copy
 import builtins
 import importlib
+import threading
 from ursina import application
 from ursina.texture import Texture
 
 
 imported_textures = dict()
+_imported_textures_lock = threading.RLock()  # load_texture_async() uses the cache from a background thread
 file_types = ('.tif', '.jpg', '.jpeg', '.png', '.gif')
 folders = [ # folder search order
     application.compressed_textures_folder,
@@ -20,8 +22,9 @@ def load_texture(name, path=None, use_cache=True, filtering='default'):
     if textureless:
         return None
 
-    if use_cache and name in imported_textures:
-        return copy(imported_textures[name])
+    with _imported_textures_lock:
+        if use_cache and name in imported_textures:
+            return copy(imported_textures[name])
 
 
     _folders = folders
@@ -43,14 +46,16 @@ def load_texture(name, path=None, use_cache=True, filtering='default'):
         if '.' in name: # got name with file extension
             for filename in folder.glob('**/' + name):
                 t = Texture(filename.resolve(), filtering=filtering)
-                imported_textures[name] = t
+                with _imported_textures_lock:
+                    imported_textures[name] = t
                 return t
 
         for filename in folder.glob('**/' + name + '.*'): # no file extension given, so try all supported
             if filename.suffix in file_types:
                 # print('found:', filename)
                 t = Texture(filename.resolve(), filtering=filtering)
-                imported_textures[name] = t
+                with _imported_textures_lock:
+                    imported_textures[name] = t
                 return t
 
     if application.development_mode and importlib.util.find_spec('psd_tools'):
@@ -62,11 +67,20 @@ def load_texture(name, path=None, use_cache=True, filtering='default'):
                 compress_textures(name)
                 return load_texture(name)
 
-    imported_textures[name] = None  # prevent searching for the same missing texture multiple times
+    with _imported_textures_lock:
+        imported_textures[name] = None  # prevent searching for the same missing texture multiple times
     return None
 
 
 
+def load_texture_async(name, callback, path=None, use_cache=True, filtering='default'):
+    '''Like load_texture(), but searches and loads on a background thread, then calls callback(texture) on the main thread. texture is None if it wasn't found.
+    Returns a concurrent.futures.Future.'''
+    from ursina.scripts import async_loader
+    return async_loader.submit(load_texture, name, path=path, use_cache=use_cache, filtering=filtering, callback=callback)
+
+
+
 def compress_textures(name=''):
     try:
         from PIL import Image
@@ -4,6 +4,8 @@ import os
 from ursina import application
 from ursina.scene import instance as scene
 from ursina.sequence import Sequence, Func, Wait
+from ursina.scripts.ordered_set import OrderedSet
+from ursina.scripts.timers import Timer
 
 
 class Empty():
@@ -38,11 +40,7 @@ def invoke(function, *args, **kwargs):  # reserved keywords: 'delay', 'unscaled'
     if ignore_paused:
         unscaled = True
 
-    return Sequence(
-        Wait(delay),
-        Func(function, *args, **kwargs),
-        auto_destroy=True, ignore_paused=ignore_paused, unscaled=unscaled, started=True,
-    )
+    return Timer(function, args, kwargs, delay=delay, unscaled=unscaled, ignore_paused=ignore_paused).start()
 
 
 def after(delay, unscaled=True):    # function for @after decorator. Use the docrator, not this.
@@ -62,25 +60,69 @@ def after(delay, unscaled=True):    # function for @after decorator. Use the doc
 
 
 
+destroy_queue = OrderedSet()   # entities passed to destroy() this frame. they get destroyed all at once at the end of the frame.
+
 def destroy(entity, delay=0):
     if delay == 0:
-        _destroy(entity)
+        if getattr(entity, '_static_root', None) is not None:   # it's part of a static entity's flattened copy
+            from ursina.scripts import static_flattening
+            static_flattening.scheduler.invalidate(entity._static_root)
+
+        if entity.eternal or getattr(entity, '_pool', None):
+            _destroy(entity)
+            return True
+
+        if entity in destroy_queue:
+            return True
+        destroy_queue.add(entity)
+        # take it out of the scene right away, so it stops updating, rendering and colliding until it actually gets destroyed
+        if entity in scene.entities:
+            scene.entities.remove(entity)
+        if hasattr(entity, '_parent') and entity._parent and hasattr(entity._parent, '_children'):
+            entity._parent._children.discard(entity)
+        _deactivate(entity)
+        entity.hide()   # not stash(), since that has to search through all the siblings
         return True
 
     return invoke(_destroy, entity, delay=delay)
     # return Sequence(Wait(delay), Func(_destroy, entity), auto_destroy=True, started=True)
 
 
-def _destroy(entity, force_destroy=False):
+def _deactivate(entity):    # unregister the entity and its descendants from scene.handlers and turn off their colliders, without changing .enabled
+    entity._enabled_in_hierarchy = False
+    entity._update_handler_registration()
+    if entity.collider:
+        entity.collider.node_path.stash()
+        scene.collidables.discard(entity)
+
+    for c in entity.children:
+        _deactivate(c)
+
+
+def flush_destroy_queue():     # called by the engine at the end of each frame
+    while destroy_queue:
+        entities = tuple(destroy_queue)
+        destroy_queue.clear()
+        destroyed = [e for e in entities if _destroy(e, _remove_node=False)]
+        for e in reversed(destroyed):   # removing nodes back to front is a lot faster when many of them have the same parent
+            e.removeNode()
+
+
+def _destroy(entity, force_destroy=False, _remove_node=True):
     # from ursina import camera
     # if not entity or entity == camera:
     #     return
 
     if entity.eternal and not force_destroy:
-        return
+        return False
+
+    destroy_queue.discard(entity)
+
+    if getattr(entity, '_pool', None) and not force_destroy:    # return it to its EntityPool instead
+        entity._pool.release(entity)
+        return False
 
-    for child in entity.children:
-        _destroy(child)
+    destroyed_children = [child for child in entity.children if _destroy(child, _remove_node=False)]
 
     if entity.collider:
         entity.collider.remove()
@@ -94,11 +136,18 @@ def _destroy(entity, force_destroy=False):
     if entity in scene.entities:
         scene.entities.remove(entity)
 
+    for handlers in scene.handlers.values():
+        handlers.discard(entity)
+
+    if getattr(entity, '_update_lod', None):
+        from ursina.scripts.update_lod import scheduler
+        scheduler.discard(entity)
+
     if entity in scene.collidables:
         scene.collidables.remove(entity)
 
-    if hasattr(entity, '_parent') and entity._parent and hasattr(entity._parent, '_children') and entity in entity._parent._children:
-        entity._parent._children.remove(entity)
+    if hasattr(entity, '_parent') and entity._parent and hasattr(entity._parent, '_children'):
+        entity._parent._children.discard(entity)
         
     for e in entity.loose_children:
         destroy(e)
@@ -123,7 +172,13 @@ def _destroy(entity, force_destroy=False):
     if entity.hasPythonTag("Entity"):
         entity.clearPythonTag("Entity")
 
-    entity.removeNode()
+    if destroyed_children:  # detach all the children at once, so removing them doesn't have to search the child list for each one
+        entity.node().remove_all_children()
+        for child in destroyed_children:
+            child.removeNode()
+
+    if _remove_node:
+        entity.removeNode()
 
     if hasattr(entity.__class__, 'instances') and entity in entity.__class__.instances:
         entity.__class__.instances.remove(entity)
@@ -132,6 +187,7 @@ def _destroy(entity, force_destroy=False):
     #     entity.texture.releaseAll()
 
     del entity
+    return True
 
 class Array2D(list):
     __slots__ = ('width', 'height', 'default_value', 'data')